@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+
+"""
+Benchmarks every encode and decode path of hamming_code.py.
+
+Usage: python3 bench_hamming_code.py [--words N] [--workers N] [--output FILE]
+
+The results are written as JSON with the throughput in words per second and latency
+percentiles for every path and error mix.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+from time import perf_counter_ns
+from typing import Callable, Dict, List, Sequence
+
+from hamming_code import MAX_TABLE_BITS, HammingCode, parallel_decode
+
+try:
+    import numpy as np
+except ImportError:
+    # The batch paths are skipped without NumPy
+    np = None
+
+# Number of errors flipped into every codeword, "parity" only flips the overall parity bit
+ERROR_MIXES = ("clean", "single", "double", "parity")
+PERCENTILES = (50, 90, 99)
+
+
+def make_words(
+    code: HammingCode, count: int, errors: str, rng: random.Random
+) -> List[int]:
+    """
+    Creates random bit-packed codewords with the given error mix.
+
+    Args:
+        code (HammingCode): Code to use
+        count (int): Number of codewords
+        errors (str): One of ERROR_MIXES
+        rng (Random): Random number generator
+    Returns:
+        list: Codewords
+    """
+    width = code.total_bits + 1
+    words = []
+    for _ in range(count):
+        word = code.encode_int(rng.getrandbits(code.data_bits))
+        if errors == "single":
+            word ^= 1 << rng.randrange(width)
+        elif errors == "double":
+            for position in rng.sample(range(width), 2):
+                word ^= 1 << position
+        elif errors == "parity":
+            word ^= 1
+        words.append(word)
+    return words
+
+
+def pack_words(code: HammingCode, words: Sequence[int]) -> bytes:
+    """
+    Packs codewords like HammingCode.encode_stream() and appends the end of stream marker.
+    The number of words has to be a multiple of code.block_words.
+
+    Args:
+        code (HammingCode): Code to use
+        words (sequence): Codewords
+    Returns:
+        bytes: Packed codewords
+    """
+    width = code.total_bits + 1
+    block_bytes = code.block_words * width // 8
+    out = bytearray()
+    for start in range(0, len(words), code.block_words):
+        packed = 0
+        for word in words[start : start + code.block_words]:
+            packed = (packed << width) | word
+        out += packed.to_bytes(block_bytes, "big")
+    # An empty stream consists of the end marker only
+    return bytes(out) + b"".join(code.encode_stream(b""))
+
+
+def percentiles(samples: List[int]) -> Dict[str, int]:
+    """
+    Returns the PERCENTILES of the given samples.
+    """
+    samples = sorted(samples)
+    return {
+        f"p{p}": samples[min(len(samples) - 1, len(samples) * p // 100)]
+        for p in PERCENTILES
+    }
+
+
+def measure_calls(function: Callable, inputs: Sequence, samples: int) -> Dict:
+    """
+    Measures a function that processes one word per call.
+
+    Args:
+        function (callable): Function to call with every input
+        inputs (sequence): Inputs
+        samples (int): Number of calls whose latency is measured individually
+    Returns:
+        dict: Words per second and latency per word in nanoseconds
+    """
+    start = perf_counter_ns()
+    for value in inputs:
+        function(value)
+    elapsed = perf_counter_ns() - start
+
+    latencies = []
+    for value in inputs[:samples]:
+        start = perf_counter_ns()
+        function(value)
+        latencies.append(perf_counter_ns() - start)
+    return {
+        "words_per_second": len(inputs) * 1e9 / max(1, elapsed),
+        "latency_unit": "word",
+        "latency_ns": percentiles(latencies),
+    }
+
+
+def measure_batches(function: Callable, batches: Sequence, words: int) -> Dict:
+    """
+    Measures a function that processes many words per call.
+
+    Args:
+        function (callable): Function to call with every batch
+        batches (sequence): Inputs
+        words (int): Total number of words in all batches
+    Returns:
+        dict: Words per second and latency per batch in nanoseconds
+    """
+    latencies = []
+    for batch in batches:
+        start = perf_counter_ns()
+        function(batch)
+        latencies.append(perf_counter_ns() - start)
+    return {
+        "words_per_second": words * 1e9 / max(1, sum(latencies)),
+        "latency_unit": "batch",
+        "latency_ns": percentiles(latencies),
+    }
+
+
+def run(
+    words: int = 100000,
+    batch_size: int = 4096,
+    samples: int = 10000,
+    workers: int = 0,
+    total_bits: int = 10,
+    data_bits: int = 6,
+    seed: int = 0,
+) -> Dict:
+    """
+    Runs all benchmarks.
+
+    Args:
+        words (int): Number of words per benchmark, rounded up to whole batches
+        batch_size (int): Number of words per call of the batch paths
+        samples (int): Number of individually timed calls of the per word paths
+        workers (int): Number of processes for parallel_decode(), 0 to skip it
+        total_bits (int): Length n of the code
+        data_bits (int): Number k of data bits
+        seed (int): Seed of the random words
+    Returns:
+        dict: Benchmark results
+    """
+    rng = random.Random(seed)
+    table = HammingCode(total_bits, data_bits)
+    paths = {
+        "bitmask": HammingCode(total_bits, data_bits, lookup_tables=False),
+        "specialized": HammingCode(
+            total_bits, data_bits, lookup_tables=False, specialized=True
+        ),
+    }
+    if table.total_bits + 1 <= MAX_TABLE_BITS:
+        paths["table"] = table
+
+    batch_size = max(1, batch_size // table.block_words) * table.block_words
+    batches = -(-words // batch_size)
+    words = batches * batch_size
+    width = table.total_bits + 1
+    to_bits = lambda value, bits: tuple(
+        (value >> i) & 1 for i in range(bits - 1, -1, -1)
+    )
+
+    results = []
+
+    def add(operation: str, path: str, errors: str, measurement: Dict) -> None:
+        results.append(
+            {"operation": operation, "path": path, "errors": errors, **measurement}
+        )
+
+    data = [rng.getrandbits(table.data_bits) for _ in range(words)]
+    data_tuples = [to_bits(value, table.data_bits) for value in data]
+    chunk_bytes = batch_size * table.data_bits // 8
+    data_bytes = bytes(rng.getrandbits(8) for _ in range(batches * chunk_bytes))
+    for name, code in paths.items():
+        add(
+            "encode",
+            f"tuple-{name}",
+            "clean",
+            measure_calls(code.encode, data_tuples, samples),
+        )
+        add(
+            "encode",
+            f"int-{name}",
+            "clean",
+            measure_calls(code.encode_int, data, samples),
+        )
+    add(
+        "encode",
+        "stream",
+        "clean",
+        measure_batches(
+            lambda chunk: b"".join(table.encode_stream(chunk)),
+            [
+                data_bytes[i : i + chunk_bytes]
+                for i in range(0, len(data_bytes), chunk_bytes)
+            ],
+            words,
+        ),
+    )
+    if np is not None:
+        add(
+            "encode",
+            "batch-numpy",
+            "clean",
+            measure_batches(
+                table.encode_batch,
+                [
+                    np.array(data_tuples[i : i + batch_size], dtype=np.uint8)
+                    for i in range(0, words, batch_size)
+                ],
+                words,
+            ),
+        )
+
+    for errors in ERROR_MIXES:
+        codewords = make_words(table, words, errors, rng)
+        tuples = [to_bits(word, width) for word in codewords]
+        for name, code in paths.items():
+            add(
+                "decode",
+                f"tuple-{name}",
+                errors,
+                measure_calls(code.decode, tuples, samples),
+            )
+            add(
+                "decode",
+                f"int-{name}",
+                errors,
+                measure_calls(code.decode_int, codewords, samples),
+            )
+
+        chunks = [codewords[i : i + batch_size] for i in range(0, words, batch_size)]
+        add(
+            "decode",
+            "sliced",
+            errors,
+            measure_batches(table.decode_sliced, chunks, words),
+        )
+        if np is not None:
+            add(
+                "decode",
+                "batch-numpy",
+                errors,
+                measure_batches(
+                    table.decode_batch,
+                    [
+                        np.array(tuples[i : i + batch_size], dtype=np.uint8)
+                        for i in range(0, words, batch_size)
+                    ],
+                    words,
+                ),
+            )
+
+        packed = [pack_words(table, chunk) for chunk in chunks]
+        out = bytearray(chunk_bytes + 1)
+        add(
+            "decode",
+            "buffer",
+            errors,
+            measure_batches(lambda src: table.decode_buffer(src, out), packed, words),
+        )
+        if workers:
+            stream = pack_words(table, codewords)
+            add(
+                "decode",
+                f"parallel-{workers}",
+                errors,
+                measure_batches(
+                    lambda src: parallel_decode(
+                        src, workers, total_bits=total_bits, data_bits=data_bits
+                    ),
+                    [stream],
+                    words,
+                ),
+            )
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": None if np is None else np.__version__,
+        "code": [table.total_bits, table.data_bits],
+        "words": words,
+        "batch_size": batch_size,
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=4096)
+    parser.add_argument("--samples", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--total-bits", type=int, default=10)
+    parser.add_argument("--data-bits", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=argparse.FileType("w"), default=sys.stdout)
+    args = parser.parse_args()
+
+    results = run(
+        words=args.words,
+        batch_size=args.batch_size,
+        samples=args.samples,
+        workers=args.workers,
+        total_bits=args.total_bits,
+        data_bits=args.data_bits,
+        seed=args.seed,
+    )
+    json.dump(results, args.output, indent=2)
+    args.output.write("\n")
+
+
+if __name__ == "__main__":
+    main()
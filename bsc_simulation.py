@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+
+"""
+Monte Carlo simulation of a Hamming code on a binary symmetric channel.
+
+Usage: python3 bsc_simulation.py --words N [--workers N] [--seed N] P [P ...]
+
+Every bit of the transmitted codewords is flipped with probability P. The bit and frame
+error rates of the decoded data and the share of every HCResult are written as JSON.
+"""
+
+import argparse
+import json
+import multiprocessing
+import sys
+from typing import Dict, List, Sequence, Union
+
+from hamming_code import HammingCode, HCResult, RESULT_CODES
+
+try:
+    import numpy as np
+except ImportError:
+    # The simulation needs NumPy, the error is raised when it runs
+    np = None
+
+Seed = Union[None, int, "np.random.SeedSequence"]
+
+# Counters returned by simulate(), the rates are derived from them
+COUNTERS = (
+    "words",
+    "bit_errors",
+    "frame_errors",
+    "valid",
+    "corrected",
+    "uncorrectable",
+)
+
+# Bit flip probability from which channel_errors() compares uniform numbers with p instead
+# of drawing the flip positions
+POSITION_DRAW_P = 0.05
+
+
+def channel_errors(
+    rng: "np.random.Generator", words: int, width: int, p: float
+) -> "np.ndarray":
+    """
+    Draws the bit flips of a binary symmetric channel. Below POSITION_DRAW_P the number of
+    flips is drawn from the binomial distribution and their positions uniformly without
+    repetition, which skips most of the random numbers. Otherwise uniform doubles are
+    compared with p, their resolution of 2^-53 does not bias the rate.
+
+    Args:
+        rng (Generator): Random number generator
+        words (int): Number of words
+        width (int): Number of bits per word
+        p (float): Bit flip probability
+    Returns:
+        ndarray: words x width boolean array, True where a bit is flipped
+    """
+    if p >= POSITION_DRAW_P:
+        return rng.random((words, width)) < p
+    bits = words * width
+    flips = np.zeros(bits, dtype=bool)
+    flips[rng.choice(bits, rng.binomial(bits, p), replace=False)] = True
+    return flips.reshape(words, width)
+
+
+def simulate(
+    p: float,
+    words: int,
+    seed: Seed = None,
+    batch_size: int = 1 << 18,
+    total_bits: int = 10,
+    data_bits: int = 6,
+) -> Dict:
+    """
+    Encodes random data words, flips every bit with probability p and decodes them again.
+    Every data bit of an uncorrectable word counts as a bit error. Requires NumPy.
+
+    Args:
+        p (float): Bit flip probability of the channel
+        words (int): Number of words to simulate
+        seed (int or SeedSequence): Seed of the random number generator
+        batch_size (int): Number of words per batch, limits the memory use
+        total_bits (int): Length n of the code
+        data_bits (int): Number k of data bits
+    Returns:
+        dict: COUNTERS, data_bits and the rates derived from them (see rates())
+    """
+    if np is None:
+        raise ImportError("simulate() requires numpy")
+    code = HammingCode(total_bits, data_bits, lookup_tables=False)
+    rng = np.random.default_rng(seed)
+    counts = {"data_bits": code.data_bits, **dict.fromkeys(COUNTERS, 0)}
+
+    for start in range(0, words, batch_size):
+        size = min(batch_size, words - start)
+        data = rng.integers(0, 2, (size, code.data_bits), dtype=np.uint8)
+        flips = channel_errors(rng, size, code.total_bits + 1, p)
+        decoded, status = code.decode_batch(code.encode_batch(data) ^ flips)
+
+        # Uncorrectable words are decoded as zeros, count all their data bits as wrong
+        # instead, so all-zero data does not hide them
+        unc = status == RESULT_CODES[HCResult.UNCORRECTABLE]
+        wrong = (decoded != data) | unc[:, None]
+        counts["words"] += size
+        counts["bit_errors"] += int(wrong.sum())
+        counts["frame_errors"] += int(wrong.any(axis=1).sum())
+        for result in HCResult:
+            counts[result.name.lower()] += int((status == RESULT_CODES[result]).sum())
+    return rates(counts)
+
+
+def rates(counts: Dict) -> Dict:
+    """
+    Adds the bit error rate, the frame error rate and the share of every HCResult to counts.
+    Uncorrectable words count as frame errors with all their data bits wrong.
+
+    Args:
+        counts (dict): COUNTERS and the number of data bits per word
+    Returns:
+        dict: COUNTERS and rates
+    """
+    words = max(1, counts["words"])
+    result = dict(counts)
+    result["bit_error_rate"] = counts["bit_errors"] / (words * counts["data_bits"])
+    result["frame_error_rate"] = counts["frame_errors"] / words
+    for name in ("valid", "corrected", "uncorrectable"):
+        result[f"{name}_rate"] = counts[name] / words
+    return result
+
+
+def sweep(
+    ps: Sequence[float],
+    words: int,
+    workers: int = 1,
+    seed: int = 0,
+    batch_size: int = 1 << 18,
+    total_bits: int = 10,
+    data_bits: int = 6,
+) -> List[Dict]:
+    """
+    Runs simulate() for every bit flip probability. The words of every probability are split
+    among the worker processes, each with an independent random stream spawned from seed,
+    so the results only depend on seed and workers.
+
+    Args:
+        ps (sequence): Bit flip probabilities
+        words (int): Number of words per probability
+        workers (int): Number of processes
+        seed (int): Root seed
+        batch_size (int): Number of words per batch and process
+        total_bits (int): Length n of the code
+        data_bits (int): Number k of data bits
+    Returns:
+        list: Result of simulate() with the probability p for every probability
+    """
+    if np is None:
+        raise ImportError("sweep() requires numpy")
+    streams = np.random.SeedSequence(seed).spawn(len(ps) * workers)
+    tasks = [
+        (
+            p,
+            words // workers + (worker < words % workers),
+            streams[i * workers + worker],
+            batch_size,
+            total_bits,
+            data_bits,
+        )
+        for i, p in enumerate(ps)
+        for worker in range(workers)
+    ]
+    if workers > 1:
+        with multiprocessing.Pool(workers) as pool:
+            parts = pool.starmap(simulate, tasks)
+    else:
+        parts = [simulate(*task) for task in tasks]
+
+    results = []
+    for i, p in enumerate(ps):
+        counts = {"data_bits": data_bits}
+        for name in COUNTERS:
+            counts[name] = sum(
+                part[name] for part in parts[i * workers : (i + 1) * workers]
+            )
+        results.append({"p": p, **rates(counts)})
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("p", type=float, nargs="+")
+    parser.add_argument("--words", type=float, default=1e6)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=1 << 18)
+    parser.add_argument("--total-bits", type=int, default=10)
+    parser.add_argument("--data-bits", type=int, default=6)
+    args = parser.parse_args()
+
+    results = sweep(
+        args.p,
+        int(args.words),
+        workers=args.workers,
+        seed=args.seed,
+        batch_size=args.batch_size,
+        total_bits=args.total_bits,
+        data_bits=args.data_bits,
+    )
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
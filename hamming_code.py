@@ -1,12 +1,38 @@
 #!/usr/bin/env python3
 
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from time import perf_counter_ns
+from types import CodeType, ModuleType
 from enum import Enum
-from typing import List, Tuple, Union
-from functools import reduce
+from typing import (
+    TYPE_CHECKING,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Tuple,
+    Union,
+)
+from itertools import product
+
+if TYPE_CHECKING:
+    # Only for the annotations, both are imported on first use
+    from multiprocessing import shared_memory
+    import numpy as np
 
 
 # IMPORTANT NOTE: DO NOT IMPORT THE ev3dev.ev3 MODULE IN THIS FILE
 Matrix = List[List[int]]
+ByteSource = Union[bytes, bytearray, memoryview, BinaryIO, Iterable[bytes]]
 
 
 class HCResult(Enum):
@@ -19,32 +45,402 @@ class HCResult(Enum):
     UNCORRECTABLE = "ERROR"
 
 
+DecodeResult = Tuple[Union[None, Tuple[int, ...]], HCResult]
+SoftDecodeResult = Tuple[Union[None, Tuple[int, ...]], HCResult, float]
+
+# Integer codes for HCResult, used by the batch and buffer interfaces
+RESULT_CODES: Dict[HCResult, int] = {
+    HCResult.VALID: 0,
+    HCResult.CORRECTED: 1,
+    HCResult.UNCORRECTABLE: 2,
+}
+RESULTS_BY_CODE: Tuple[HCResult, ...] = tuple(RESULT_CODES)
+# Looking up enum members is slow, hot paths compare against this instead
+_VALID = HCResult.VALID
+
+# Largest codeword (including the overall parity bit) for which lookup tables are built by default
+MAX_TABLE_BITS = 12
+
+# Largest number of data bits for which the soft decoder searches the whole codebook
+MAX_SOFT_DATA_BITS = 12
+
+# Format of the cache files written with cache_dir, bump the version whenever the layout
+# changes. Header: magic, version, n, k, block_words, flags, digest of the derivation
+# (see HammingCode.__derivation_digest()), CRC-32 and length of the payload (little-endian)
+CACHE_VERSION = 2
+_CACHE_MAGIC = b"HAMC"
+_CACHE_HEADER = struct.Struct("<4sHHHHHIII")
+# Flag for cache files that contain the lookup tables
+_CACHE_TABLES = 1
+
+# Translation tables that extract bit i (0 = most significant bit) of every byte
+_BIT_TABLES: Tuple[bytes, ...] = tuple(
+    bytes((value >> (7 - i)) & 1 for value in range(256)) for i in range(8)
+)
+
+
+def _bits_to_int(bits: Tuple[int, ...]) -> int:
+    """
+    Packs a tuple of bits into an integer, the first bit is the most significant bit.
+    """
+    value = 0
+    for bit in bits:
+        value = (value << 1) | bit
+    return value
+
+
+def _code_digest(code: CodeType, crc: int = 0) -> int:
+    """
+    Updates a CRC-32 with the bytecode, constants and names of a function body, including
+    nested functions. Independent of the hash seed, but not of the Python version.
+    """
+    crc = zlib.crc32(code.co_code, crc)
+    crc = zlib.crc32(repr(code.co_names).encode(), crc)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            crc = _code_digest(const, crc)
+        elif isinstance(const, frozenset):
+            crc = zlib.crc32(repr(sorted(map(repr, const))).encode(), crc)
+        else:
+            crc = zlib.crc32(repr(const).encode(), crc)
+    return crc
+
+
+def _numpy(function: str) -> ModuleType:
+    """
+    Imports NumPy on first use. It is optional and only needed by the batch interface, so
+    importing this module stays fast without it.
+
+    Args:
+        function (str): Name of the calling function for the error message
+    Raises:
+        ImportError: If NumPy is not installed
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(f"{function}() requires numpy") from None
+    return numpy
+
+
+def _int_to_bits(value: int, width: int) -> Tuple[int, ...]:
+    """
+    Unpacks an integer into a tuple of width bits, the first bit is the most significant bit.
+    """
+    return tuple((value >> i) & 1 for i in range(width - 1, -1, -1))
+
+
+def _iter_chunks(source: ByteSource, chunk_size: int) -> Iterator[bytes]:
+    """
+    Splits a bytes-like object, a binary file or an iterable of byte strings into
+    chunks of chunk_size bytes. Only the last chunk may be shorter.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source).cast("B")
+        for start in range(0, len(view), chunk_size):
+            yield view[start : start + chunk_size]
+        return
+
+    if hasattr(source, "read"):
+        read = source.read
+        source = iter(lambda: read(chunk_size), b"")
+
+    buffer = bytearray()
+    for data in source:
+        buffer += data
+        while len(buffer) >= chunk_size:
+            yield bytes(buffer[:chunk_size])
+            del buffer[:chunk_size]
+    if buffer:
+        yield bytes(buffer)
+
+
+class DecoderStats:
+    """
+    Counts the results of HammingCode.decode() and decode_int(), the corrected bit positions
+    and the decode latency
+    """
+
+    def __init__(self, total_bits: int):
+        """
+        Initializes all counters with zero.
+
+        Args:
+            total_bits (int): Length n of the code without the overall parity bit
+        """
+        self.total_bits = total_bits
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Sets all counters to zero.
+        """
+        # Number of results, indexed by RESULT_CODES
+        self.results = [0] * len(RESULT_CODES)
+        # Number of corrected errors per bit position of the n-bit word
+        self.corrected_positions = [0] * self.total_bits
+        # Number of corrected errors in the overall parity bit
+        self.parity_corrections = 0
+        # Bucket i counts decode latencies from 2^(i-1) to 2^i - 1 nanoseconds
+        self.latency_buckets = [0] * 40
+
+    def record(self, result: HCResult, position: int, nanoseconds: int) -> None:
+        """
+        Records the result of one decoded word.
+
+        Args:
+            result (HCResult): Result of the decoder
+            position (int): Corrected bit position, total_bits for the overall parity bit,
+                ignored unless the result is CORRECTED
+            nanoseconds (int): Decode latency
+        """
+        self.results[RESULT_CODES[result]] += 1
+        if result is HCResult.CORRECTED:
+            if position == self.total_bits:
+                self.parity_corrections += 1
+            else:
+                self.corrected_positions[position] += 1
+        self.latency_buckets[min(nanoseconds.bit_length(), 39)] += 1
+
+    def snapshot(self, reset: bool = False) -> Dict:
+        """
+        Returns a copy of all counters.
+
+        Args:
+            reset (bool): Set all counters to zero afterwards
+        Returns:
+            dict: Counters by name, results by HCResult name
+        """
+        snapshot = {
+            "results": {
+                result.name: self.results[code] for result, code in RESULT_CODES.items()
+            },
+            "corrected_positions": list(self.corrected_positions),
+            "parity_corrections": self.parity_corrections,
+            "latency_buckets": list(self.latency_buckets),
+        }
+        if reset:
+            self.reset()
+        return snapshot
+
+
+class _SharedCode:
+    """
+    Matrices and lookup tables of one code, shared by all HammingCode instances with the same
+    parameters. The matrices are fixed once registered, tables, codebook and specialized
+    are only filled in lazily under _registry_lock.
+    """
+
+    __slots__ = (
+        "g_masks",
+        "h_masks",
+        "error_positions",
+        "block_words",
+        "tables",
+        "codebook",
+        "specialized",
+    )
+
+
+_registry: Dict[Tuple[int, int], _SharedCode] = {}
+_registry_lock = threading.Lock()
+
+
 class HammingCode:
     """
     Provides decoding capabilities for the specified Hamming Code
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        total_bits: int = 10,
+        data_bits: int = 6,
+        lookup_tables: Union[None, bool] = None,
+        stats: bool = False,
+        specialized: bool = False,
+        cache_dir: Union[None, str] = None,
+    ):
         """
         Initializes the class HammingCode with all values necessary.
+
+        Args:
+            total_bits (int): Length n of the code without the overall parity bit
+            data_bits (int): Number k of data bits, any n <= 2^(n-k) - 1 is supported,
+                e.g. (7, 4), (15, 11), (31, 26), (63, 57) or the shortened default (10, 6)
+            lookup_tables (bool): Precompute encode and decode tables for all possible words,
+                by default only if the codewords have at most MAX_TABLE_BITS bits
+            stats (bool): Record the results of decode() and decode_int() in self.stats
+            specialized (bool): Generate and compile straight-line encode and decode functions
+                for this code, used for words that are not covered by lookup tables.
+                The generated source is stored in self.specialized_source.
+            cache_dir (str): Directory of cache files with the derived matrices and lookup
+                tables, loaded instead of deriving them again and (re)written if missing
+                or stale. Writing the cache is best effort.
+        Raises:
+            ValueError: If there is no Hamming code with the given parameters
         """
-        self.total_bits = 10  # n
-        self.data_bits = 6  # k
-        self.parity_bits = 4  # r
-
-        # Predefined non-systematic generator matrix G'
-        gns: Matrix = [
-            [1, 1, 1, 0, 0, 0, 0, 1, 0, 0],
-            [0, 1, 0, 0, 1, 0, 0, 1, 0, 0],
-            [1, 0, 0, 1, 0, 1, 0, 0, 0, 0],
-            [0, 0, 0, 1, 0, 0, 1, 1, 0, 0],
-            [1, 1, 0, 1, 0, 0, 0, 1, 1, 0],
-            [1, 0, 0, 1, 0, 0, 0, 1, 0, 1],
-        ]
+        self.total_bits = total_bits  # n
+        self.data_bits = data_bits  # k
+        self.parity_bits = total_bits - data_bits  # r
+        if data_bits < 1 or self.parity_bits < 2 or total_bits >= 1 << self.parity_bits:
+            raise ValueError(f"There is no ({total_bits}, {data_bits}) Hamming code")
+
+        if lookup_tables is None:
+            lookup_tables = total_bits + 1 <= MAX_TABLE_BITS
+        # Keyword arguments of the constructor besides n and k, e.g. to create an
+        # equivalent code in another process
+        self.options: Dict[str, Union[None, bool, str]] = {
+            "lookup_tables": lookup_tables,
+            "stats": stats,
+            "specialized": specialized,
+            "cache_dir": cache_dir,
+        }
+        self.stats: Union[None, DecoderStats] = (
+            DecoderStats(total_bits) if stats else None
+        )
+
+        # Matrices and tables are derived once per process and shared by all instances
+        with _registry_lock:
+            cache_path = None
+            if cache_dir is not None:
+                cache_path = os.path.join(
+                    cache_dir, f"hamming_{total_bits}_{data_bits}.bin"
+                )
+            modified = False
+            shared = _registry.get((total_bits, data_bits))
+            # The cache file only has to be checked if the code was not loaded from it
+            current = False
+            if shared is None and cache_path is not None:
+                shared = self.__load_cache(cache_path, lookup_tables)
+                current = shared is not None
+            if shared is None:
+                shared = self.__derive_code()
+                modified = True
+            _registry[(total_bits, data_bits)] = shared
+
+            # Rows of G and H as bitmasks, the first column is the most significant bit
+            self.g_masks: Tuple[int, ...] = shared.g_masks
+            self.h_masks: Tuple[int, ...] = shared.h_masks
+            self.__error_positions = shared.error_positions
+            # Smallest number of words whose data bits and packed codewords fill whole bytes
+            self.block_words: int = shared.block_words
 
+            if lookup_tables and shared.tables is None:
+                shared.tables = self.__build_tables()
+                modified = True
+            if cache_path is not None and (
+                modified
+                or not current
+                and not self.__cache_is_current(cache_path, shared.tables is not None)
+            ):
+                self.__save_cache(cache_path, shared)
+            if specialized and shared.specialized is None:
+                shared.specialized = self.__compile_specialized()
+        self.__shared = shared
+
+        # Functions for words without lookup table entries
+        self.specialized_source: Union[None, str] = None
+        self.__encode_word: Callable[[int], int] = self.__encode_mask
+        self.__decode_word: Callable[[int], Tuple[Union[None, int], HCResult]] = (
+            self.__decode_mask
+        )
+        if specialized:
+            (
+                self.specialized_source,
+                self.__encode_word,
+                self.__decode_word,
+            ) = shared.specialized
+
+        # Lookup tables for all 2^k data words and 2^(n+1) received words
+        self.__encode_ints: Union[None, Tuple[int, ...]] = None
+        self.__decode_ints: Union[
+            None, Tuple[Tuple[Union[None, int], HCResult], ...]
+        ] = None
+        self.__encode_table: Union[None, Dict[Tuple[int, ...], Tuple[int, ...]]] = None
+        self.__decode_table: Union[None, Dict[Tuple[int, ...], DecodeResult]] = None
+        if lookup_tables:
+            (
+                self.__encode_ints,
+                self.__decode_ints,
+                self.__encode_table,
+                self.__decode_table,
+            ) = shared.tables
+
+    @property
+    def g(self) -> Matrix:
+        """
+        Systematic generator matrix G (a new list on every access)
+        """
+        return [list(_int_to_bits(row, self.total_bits)) for row in self.g_masks]
+
+    @property
+    def h(self) -> Matrix:
+        """
+        Systematic parity-check matrix H (a new list on every access)
+        """
+        return [list(_int_to_bits(row, self.total_bits)) for row in self.h_masks]
+
+    def __derive_code(self) -> "_SharedCode":
+        """
+        Derives the systematic matrices of the code and everything that only depends on them.
+
+        Returns:
+            _SharedCode: Frozen data of the code, without lookup tables
+        """
         # Convert non-systematic G' into systematic matrices G, H
-        self.g = self.__convert_to_g(gns)
-        self.h = self.__derive_h(self.g)
+        g = self.__convert_to_g(self.__non_systematic_g())
+        h = self.__derive_h(g)
+
+        shared = _SharedCode()
+        shared.g_masks = tuple(_bits_to_int(row) for row in g)
+        shared.h_masks = tuple(_bits_to_int(row) for row in h)
+        shared.error_positions = self.__find_error_positions(shared.h_masks)
+        shared.block_words = next(
+            words
+            for words in range(1, 9)
+            if words * self.data_bits % 8 == 0
+            and words * (self.total_bits + 1) % 8 == 0
+        )
+        shared.tables = None
+        shared.codebook = None
+        shared.specialized = None
+        return shared
+
+    def __non_systematic_g(self) -> Matrix:
+        """
+        Returns the non-systematic generator matrix G' the code is derived from.
+        """
+        if (self.total_bits, self.data_bits) == (10, 6):
+            # Predefined non-systematic generator matrix G'
+            return [
+                [1, 1, 1, 0, 0, 0, 0, 1, 0, 0],
+                [0, 1, 0, 0, 1, 0, 0, 1, 0, 0],
+                [1, 0, 0, 1, 0, 1, 0, 0, 0, 0],
+                [0, 0, 0, 1, 0, 0, 1, 1, 0, 0],
+                [1, 1, 0, 1, 0, 0, 0, 1, 1, 0],
+                [1, 0, 0, 1, 0, 0, 0, 1, 0, 1],
+            ]
+        return self.__positional_g()
+
+    def __derivation_digest(self) -> int:
+        """
+        Returns a CRC-32 of everything the cached data is derived from: CACHE_VERSION, the
+        non-systematic G' and the code of the functions that derive the matrices and tables
+        from it. Cache files with another digest are stale.
+        """
+        crc = zlib.crc32(CACHE_VERSION.to_bytes(2, "little"))
+        gns = self.__non_systematic_g()
+        crc = zlib.crc32(bytes(bit for row in gns for bit in row), crc)
+        for method in (
+            self.__convert_to_g,
+            self.__transpose,
+            self.__derive_h,
+            self.__find_error_positions,
+            self.__encode_mask,
+            self.__decode_mask,
+        ):
+            crc = _code_digest(method.__code__, crc)
+        return crc
 
     def __transpose(self, matrix: Matrix) -> Matrix:
         """
@@ -58,31 +454,66 @@ class HammingCode:
 
         return list(map(list, zip(*matrix)))
 
+    def __positional_g(self) -> Matrix:
+        """
+        Builds the non-systematic generator matrix of the classic Hamming code, where the
+        parity bits sit at the positions 1, 2, 4, ... and cover every position that has the
+        corresponding bit set. Shortened codes drop the last data positions.
+
+        Returns:
+            list: Non-systematic generator matrix
+        """
+        parity_positions = [1 << i for i in range(self.parity_bits)]
+        data_positions = [
+            position
+            for position in range(1, 1 << self.parity_bits)
+            if position & (position - 1)
+        ][: self.data_bits]
+        columns = sorted(parity_positions + data_positions)
+        return [
+            [
+                int(
+                    column == position
+                    or column in parity_positions
+                    and bool(position & column)
+                )
+                for column in columns
+            ]
+            for position in data_positions
+        ]
+
     def __convert_to_g(self, gns: Matrix) -> Matrix:
         """
-        Converts a non-systematic generator matrix into a systematic
+        Converts a non-systematic generator matrix into a systematic one by Gauss-Jordan
+        elimination over GF(2). If the first k columns are not independent the pivot columns
+        are moved to the front, which yields an equivalent code.
 
         Args:
             gns (List): Non-systematic generator matrix
+        Raises:
+            ValueError: If the generator matrix does not have full rank
         Returns:
             list: Converted systematic generator matrix
         """
-        g = gns.copy()
-        steps = [
-            (1, (3, 5, 6)),
-            (2, (1, 3, 6)),
-            (3, (1, 5, 6)),
-            (4, (1, 3)),
-            (5, (2, 3)),
-            (6, (1, 2, 5)),
-        ]
-        for step in steps:
-            working_row = g[step[0] - 1]
-            for target_row in step[1]:
-                g[target_row - 1] = [
-                    (a - b) % 2 for a, b in zip(working_row, g[target_row - 1])
-                ]
-        return g
+        g = [row.copy() for row in gns]
+        pivots = []
+        for column in range(len(g[0])):
+            if len(pivots) == len(g):
+                break
+            row = len(pivots)
+            pivot = next((i for i in range(row, len(g)) if g[i][column]), None)
+            if pivot is None:
+                continue
+            g[row], g[pivot] = g[pivot], g[row]
+            for target_row in range(len(g)):
+                if target_row != row and g[target_row][column]:
+                    g[target_row] = [(a - b) % 2 for a, b in zip(g[row], g[target_row])]
+            pivots.append(column)
+        if len(pivots) != len(g):
+            raise ValueError("Generator matrix does not have full rank")
+
+        order = pivots + [i for i in range(len(g[0])) if i not in pivots]
+        return [[row[i] for i in order] for row in g]
 
     def __derive_h(self, g: Matrix) -> Matrix:
         """
@@ -100,6 +531,334 @@ class HammingCode:
         parity_matrix = self.__transpose(g)[self.data_bits :]
         return [a + b for a, b in zip(parity_matrix, identity_matrix)]
 
+    def __find_error_positions(self, h_masks: Tuple[int, ...]) -> Tuple[int, ...]:
+        """
+        Finds the bit position in the n-bit word that causes each syndrome.
+
+        Args:
+            h_masks (tuple): Rows of H as bitmasks
+        Returns:
+            list: Bit position (0 = first bit) for every syndrome, -1 if no single column of H matches
+        """
+        full_mask = (1 << self.total_bits) - 1
+        positions = []
+        for syndrome in range(1 << self.parity_bits):
+            # And all rows of H (or their complement if the syndrome bit is 0),
+            # the set bits mark the columns that match the syndrome
+            match = full_mask
+            for i, row in enumerate(h_masks):
+                bit = (syndrome >> (self.parity_bits - 1 - i)) & 1
+                match &= row if bit else ~row & full_mask
+            if match.bit_count() == 1:
+                positions.append(self.total_bits - match.bit_length())
+            else:
+                positions.append(-1)
+        return tuple(positions)
+
+    def __load_cache(self, path: str, tables: bool) -> Union[None, "_SharedCode"]:
+        """
+        Loads the derived code from a cache file written by __save_cache(). The file is
+        memory-mapped and only the requested parts are copied out of it.
+
+        Args:
+            path (str): Cache file
+            tables (bool): Load the lookup tables as well, if the file contains them
+        Returns:
+            _SharedCode: Code read from the file, None if the file is missing, belongs to
+                another code or version, is stale or is damaged
+        """
+        try:
+            with open(path, "rb") as file:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    with memoryview(data) as view:
+                        return self.__parse_cache(view, tables)
+        except (OSError, ValueError):
+            # Missing, empty or unreadable files are rebuilt
+            return None
+
+    def __check_cache(self, view: memoryview) -> Union[None, Tuple[int, int]]:
+        """
+        Checks the header and the checksums of the contents of a cache file.
+
+        Returns:
+            tuple: block_words and flags, None if the file belongs to another code or
+                version, is stale or is damaged
+        """
+        n, k = self.total_bits, self.data_bits
+        if len(view) < _CACHE_HEADER.size:
+            return None
+        magic, version, cached_n, cached_k, block_words, flags, digest, crc, length = (
+            _CACHE_HEADER.unpack_from(view)
+        )
+        with view[_CACHE_HEADER.size :] as payload:
+            if (
+                (magic, version, cached_n, cached_k)
+                != (_CACHE_MAGIC, CACHE_VERSION, n, k)
+                or digest != self.__derivation_digest()
+                or len(payload) != length
+                or zlib.crc32(payload) != crc
+            ):
+                return None
+        return block_words, flags
+
+    def __cache_is_current(self, path: str, tables: bool) -> bool:
+        """
+        Checks whether a cache file is valid for this code without loading it.
+
+        Args:
+            path (str): Cache file
+            tables (bool): The file has to contain the lookup tables
+        Returns:
+            bool: True if the file does not have to be (re)written
+        """
+        try:
+            with open(path, "rb") as file:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    with memoryview(data) as view:
+                        header = self.__check_cache(view)
+        except (OSError, ValueError):
+            return False
+        return header is not None and (not tables or bool(header[1] & _CACHE_TABLES))
+
+    def __parse_cache(
+        self, view: memoryview, tables: bool
+    ) -> Union[None, "_SharedCode"]:
+        """
+        Parses the contents of a cache file, see __load_cache().
+        """
+        n, k, r = self.total_bits, self.data_bits, self.parity_bits
+        header = self.__check_cache(view)
+        if header is None:
+            return None
+        block_words, flags = header
+        payload = view[_CACHE_HEADER.size :]
+
+        mask_bytes = (n + 7) // 8
+        masks = [
+            int.from_bytes(payload[i : i + mask_bytes], "big")
+            for i in range(0, (k + r) * mask_bytes, mask_bytes)
+        ]
+        position = (k + r) * mask_bytes
+        arrays = []
+        for typecode, count in (("h", 1 << r), ("I", 1 << k), ("I", 1 << (n + 1))):
+            if typecode == "I" and not (tables and flags & _CACHE_TABLES):
+                break
+            values = array(typecode)
+            size = count * values.itemsize
+            values.frombytes(payload[position : position + size])
+            if sys.byteorder == "big":
+                values.byteswap()
+            arrays.append(values)
+            position += size
+
+        shared = _SharedCode()
+        shared.g_masks = tuple(masks[:k])
+        shared.h_masks = tuple(masks[k:])
+        shared.error_positions = tuple(arrays[0])
+        shared.block_words = block_words
+        shared.tables = None
+        shared.codebook = None
+        shared.specialized = None
+        if len(arrays) == 3:
+            # Decode table entries are the data word followed by 2 bits of result code
+            uncorrectable = RESULT_CODES[HCResult.UNCORRECTABLE]
+            decode_ints = tuple(
+                (
+                    None if value & 3 == uncorrectable else value >> 2,
+                    RESULTS_BY_CODE[value & 3],
+                )
+                for value in arrays[2]
+            )
+            shared.tables = self.__complete_tables(tuple(arrays[1]), decode_ints)
+        return shared
+
+    def __save_cache(self, path: str, shared: "_SharedCode") -> None:
+        """
+        Writes the derived code (and its lookup tables, if built) to a cache file. The file is
+        replaced atomically, errors are ignored since the cache is only an optimization.
+
+        Args:
+            path (str): Cache file
+            shared (_SharedCode): Code to store
+        """
+        mask_bytes = (self.total_bits + 7) // 8
+        payload = bytearray()
+        for mask in shared.g_masks + shared.h_masks:
+            payload += mask.to_bytes(mask_bytes, "big")
+        arrays = [array("h", shared.error_positions)]
+        flags = 0
+        if shared.tables is not None:
+            encode_ints, decode_ints = shared.tables[:2]
+            arrays.append(array("I", encode_ints))
+            arrays.append(
+                array(
+                    "I",
+                    (
+                        ((data or 0) << 2) | RESULT_CODES[result]
+                        for data, result in decode_ints
+                    ),
+                )
+            )
+            flags |= _CACHE_TABLES
+        for values in arrays:
+            if sys.byteorder == "big":
+                values.byteswap()
+            payload += values.tobytes()
+
+        header = _CACHE_HEADER.pack(
+            _CACHE_MAGIC,
+            CACHE_VERSION,
+            self.total_bits,
+            self.data_bits,
+            shared.block_words,
+            flags,
+            self.__derivation_digest(),
+            zlib.crc32(payload),
+            len(payload),
+        )
+        # The kernel applies the umask, so other users of the directory can read the cache
+        temporary = f"{path}.{os.getpid()}-{os.urandom(4).hex()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            fd = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    file.write(header + payload)
+                os.replace(temporary, path)
+            except OSError:
+                os.unlink(temporary)
+        except OSError:
+            pass
+
+    def __build_tables(self) -> Tuple:
+        """
+        Precomputes the results of encode() and decode() for every possible input word.
+
+        Returns:
+            tuple: Tables for encode_int(), decode_int(), encode() and decode()
+        """
+        encode_ints = tuple(
+            self.__encode_mask(data) for data in range(1 << self.data_bits)
+        )
+        decode_ints = tuple(
+            self.__decode_mask(word) for word in range(1 << (self.total_bits + 1))
+        )
+        return self.__complete_tables(encode_ints, decode_ints)
+
+    def __complete_tables(
+        self,
+        encode_ints: Tuple[int, ...],
+        decode_ints: Tuple[Tuple[Union[None, int], HCResult], ...],
+    ) -> Tuple:
+        """
+        Adds the tables of the tuple interface to the tables of the int interface.
+
+        Returns:
+            tuple: Tables for encode_int(), decode_int(), encode() and decode()
+        """
+        # product() yields the tuples of all words in the order of their integer values
+        data_words = list(product((0, 1), repeat=self.data_bits))
+        code_words = list(product((0, 1), repeat=self.total_bits + 1))
+        encode_table = dict(zip(data_words, [code_words[word] for word in encode_ints]))
+        decode_table = dict(
+            zip(
+                code_words,
+                [
+                    (None if data is None else data_words[data], result)
+                    for data, result in decode_ints
+                ],
+            )
+        )
+        return encode_ints, decode_ints, encode_table, decode_table
+
+    def __generate_source(self) -> str:
+        """
+        Generates straight-line Python source of encode_int() and decode_int() for this code.
+        Every parity bit and syndrome bit is the parity of the word masked with the matching
+        column of G or row of H.
+
+        Returns:
+            str: Source of the functions encode_int(data) and decode_int(word)
+        """
+        k, r = self.data_bits, self.parity_bits
+
+        def parity(name: str, mask: int, bits: int, shift: int) -> str:
+            return f"((({name} & 0b{mask:0{bits}b}).bit_count() & 1) << {shift})"
+
+        # Data bits that contribute to every parity bit, the columns of P in G = [I | P]
+        parity_masks = [
+            sum(
+                ((row >> (r - 1 - j)) & 1) << (k - 1 - i)
+                for i, row in enumerate(self.g_masks)
+            )
+            for j in range(r)
+        ]
+        flips = tuple(
+            0 if position < 0 else 1 << (self.total_bits - 1 - position)
+            for position in self.__error_positions
+        )
+
+        lines = [
+            f"# Generated from G and H of the ({self.total_bits}, {k}) Hamming code",
+            f"_FLIPS = {flips!r}",
+            "",
+            "",
+            "def encode_int(data):",
+            "    x = (",
+            f"        (data << {r})",
+        ]
+        lines += [
+            f"        | {parity('data', mask, k, r - 1 - j)}"
+            for j, mask in enumerate(parity_masks)
+        ]
+        lines += [
+            "    )",
+            "    return (x << 1) | (x.bit_count() & 1)",
+            "",
+            "",
+            "def decode_int(word):",
+            "    x = word >> 1",
+            "    syndrome = (",
+            f"        {parity('x', self.h_masks[0], self.total_bits, r - 1)}",
+        ]
+        lines += [
+            f"        | {parity('x', mask, self.total_bits, r - 1 - i)}"
+            for i, mask in enumerate(self.h_masks)
+            if i
+        ]
+        lines += [
+            "    )",
+            "    if word.bit_count() & 1:",
+            "        if not syndrome:",
+            f"            return x >> {r}, CORRECTED",
+            "        flip = _FLIPS[syndrome]",
+            "        if flip:",
+            f"            return (x ^ flip) >> {r}, CORRECTED",
+            "        return None, UNCORRECTABLE",
+            "    if syndrome:",
+            "        return None, UNCORRECTABLE",
+            f"    return x >> {r}, VALID",
+            "",
+        ]
+        return "\n".join(lines)
+
+    def __compile_specialized(self) -> Tuple:
+        """
+        Compiles the source of __generate_source().
+
+        Returns:
+            tuple: Source, encode function and decode function
+        """
+        source = self.__generate_source()
+        namespace = {
+            "VALID": HCResult.VALID,
+            "CORRECTED": HCResult.CORRECTED,
+            "UNCORRECTABLE": HCResult.UNCORRECTABLE,
+        }
+        name = f"<hamming_code ({self.total_bits}, {self.data_bits})>"
+        exec(compile(source, name, "exec"), namespace)
+        return source, namespace["encode_int"], namespace["decode_int"]
+
     def encode(self, source_word: Tuple[int, ...]) -> Tuple[int, ...]:
         """
         Encodes the given word and returns the new codeword as tuple.
@@ -109,70 +868,1163 @@ class HammingCode:
         Returns:
             tuple: n-tuple (length depends on number of total bits)
         """
-        encoded_word = tuple(
-            sum(a * b for a, b in zip(source_word, col)) % 2
-            for col in self.__transpose(self.g)
+        if self.__encode_table is not None:
+            encoded_word = self.__encode_table.get(tuple(source_word))
+            if encoded_word is not None:
+                return encoded_word
+        return _int_to_bits(
+            self.encode_int(_bits_to_int(source_word)), self.total_bits + 1
         )
 
-        return encoded_word + (sum(encoded_word) % 2,)
+    def decode(self, encoded_word: Tuple[int, ...]) -> DecodeResult:
+        """
+        Checks the channel alphabet word for errors and attempts to decode it.
+        Args:
+            encoded_word (tuple): n-tuple (length depends on number of total bits)
+        Returns:
+            Union: (m-tuple, HCResult) or (None, HCResult)(length depends on number of data bits)
+        """
+        if self.__decode_table is not None and self.stats is None:
+            result = self.__decode_table.get(tuple(encoded_word))
+            if result is not None:
+                return result
+        data, result = self.decode_int(_bits_to_int(encoded_word))
+        return (None if data is None else _int_to_bits(data, self.data_bits)), result
 
-    def __get_syndrome(self, x: Tuple[int, ...]) -> int:
+    def encode_int(self, data: int) -> int:
         """
-        Returns the syndrome of the given word.
+        Encodes the given bit-packed word. The first bit of the tuple representation is the most significant bit.
 
         Args:
-            x (tuple): n-tuple (length depends on number of total bits)
+            data (int): k-bit data word
         Returns:
-            tuple: r-tuple (length depends on number of parity bits)
+            int: (n+1)-bit codeword, the overall parity bit is the least significant bit
         """
-        return tuple(sum(a * b for a, b in zip(x, col)) % 2 for col in self.h)
+        if self.__encode_ints is not None:
+            return self.__encode_ints[data]
+        return self.__encode_word(data)
 
-    def decode(
-        self, encoded_word: Tuple[int, ...]
-    ) -> Tuple[Union[None, Tuple[int, ...]], HCResult]:
+    def decode_int(self, word: int) -> Tuple[Union[None, int], HCResult]:
         """
-        Checks the channel alphabet word for errors and attempts to decode it.
+        Checks the bit-packed channel alphabet word for errors and attempts to decode it.
+
         Args:
-            encoded_word (tuple): n-tuple (length depends on number of total bits)
+            word (int): (n+1)-bit codeword, the overall parity bit is the least significant bit
         Returns:
-            Union: (m-tuple, HCResult) or (None, HCResult)(length depends on number of data bits)
+            Union: (int, HCResult) or (None, HCResult)
+        """
+        if self.stats is not None:
+            return self.__decode_recorded(word)
+        if self.__decode_ints is not None:
+            return self.__decode_ints[word]
+        return self.__decode_word(word)
+
+    def __decode_recorded(self, word: int) -> Tuple[Union[None, int], HCResult]:
+        """
+        Decodes the bit-packed word like decode_int() and records the result in stats.
+
+        Args:
+            word (int): (n+1)-bit codeword
+        Returns:
+            Union: (int, HCResult) or (None, HCResult)
+        """
+        start = perf_counter_ns()
+        if self.__decode_ints is not None:
+            data, result = self.__decode_ints[word]
+        else:
+            data, result = self.__decode_word(word)
+        elapsed = perf_counter_ns() - start
+
+        position = -1
+        if result is HCResult.CORRECTED:
+            syndrome = self.__get_syndrome(word >> 1)
+            position = self.__error_positions[syndrome] if syndrome else self.total_bits
+        self.stats.record(result, position, elapsed)
+        return data, result
+
+    def __encode_mask(self, data: int) -> int:
+        """
+        Computes the codeword for the given data word from the rows of G.
+
+        Args:
+            data (int): k-bit data word
+        Returns:
+            int: (n+1)-bit codeword
         """
-        overall_parity_ok = sum(encoded_word) % 2 == 0
-        syndrome = self.__get_syndrome(encoded_word[:-1])
-        syndrome_bits = sum(syndrome)
+        encoded_word = 0
+        for i, row in enumerate(self.g_masks):
+            if (data >> (self.data_bits - 1 - i)) & 1:
+                encoded_word ^= row
+        return (encoded_word << 1) | (encoded_word.bit_count() & 1)
 
+    def __get_syndrome(self, x: int) -> int:
+        """
+        Returns the syndrome of the given word.
 
+        Args:
+            x (int): n-bit word without the overall parity bit
+        Returns:
+            int: r-bit syndrome, the first row of H is the most significant bit
+        """
+        syndrome = 0
+        for row in self.h_masks:
+            syndrome = (syndrome << 1) | ((x & row).bit_count() & 1)
+        return syndrome
 
-        if overall_parity_ok and syndrome_bits == 0:
+    def __decode_mask(self, word: int) -> Tuple[Union[None, int], HCResult]:
+        """
+        Computes the result of decode_int() from the rows of H.
+
+        Args:
+            word (int): (n+1)-bit codeword
+        Returns:
+            Union: (int, HCResult) or (None, HCResult)
+        """
+        overall_parity_ok = word.bit_count() & 1 == 0
+        x = word >> 1
+        syndrome = self.__get_syndrome(x)
+
+        if overall_parity_ok and syndrome == 0:
             # No error
-            return tuple(encoded_word[: self.data_bits]), HCResult.VALID
-        elif not overall_parity_ok and syndrome_bits == 0:
+            return x >> self.parity_bits, HCResult.VALID
+        elif not overall_parity_ok and syndrome == 0:
             # Error in overall parity bit, data is valid
-            return tuple(encoded_word[: self.data_bits]), HCResult.CORRECTED
-        
-        elif overall_parity_ok and syndrome_bits >= 1:
+            return x >> self.parity_bits, HCResult.CORRECTED
+        elif overall_parity_ok:
             # Multiple errors, uncorrectable
             return None, HCResult.UNCORRECTABLE
-        elif not overall_parity_ok and syndrome_bits >= 1:
-            encoded_word = list(encoded_word)
-            # Search for the column in H that matches the syndrome
-            error_position_mask = reduce(
-                # and all the columns, resulting in a tuple of 1s and 0s where 1s indicate the error positions
-                lambda total, new: tuple(a & b  for a,b in zip(total , new)),
-                # for each row in H, return the row if the syndrome bit is 1, otherwise return the row with all bits flipped
-                # when anding the rows, the result will be a tuple of 1s and 0s where 1s indicate the positions the syndrome matches the column
-                (mask if s == 1 else tuple(val^1 for val in mask) for s, mask in zip(syndrome, self.h))
+
+        # Flip the bit at the position of the column in H that matches the syndrome
+        position = self.__error_positions[syndrome]
+        if position < 0:
+            return None, HCResult.UNCORRECTABLE
+        x ^= 1 << (self.total_bits - 1 - position)
+        return x >> self.parity_bits, HCResult.CORRECTED
+
+    def encode_batch(self, words: "np.ndarray") -> "np.ndarray":
+        """
+        Encodes many words at once. Requires NumPy.
+
+        Args:
+            words (ndarray): N x k array of data bits
+        Returns:
+            ndarray: N x (n+1) array of codeword bits
+        """
+        np = _numpy("encode_batch")
+        words = np.asarray(words, dtype=np.uint8).reshape(-1, self.data_bits)
+        # The sums wrap around at 256, which does not change their parity
+        encoded = (words @ np.array(self.g, dtype=np.uint8)) & 1
+        parity = encoded.sum(axis=1, dtype=np.uint8) & 1
+        return np.hstack((encoded, parity[:, None]))
+
+    def decode_sliced(self, words: Iterable[int]) -> Tuple[List[int], array]:
+        """
+        Checks many bit-packed channel alphabet words at once and attempts to decode them.
+        The words are transposed into one bit plane per codeword bit, each word being a
+        byte-wide lane of the plane, so every step of decode_int() runs on all words
+        with a single integer operation.
+
+        Args:
+            words (iterable): (n+1)-bit codewords, the overall parity bit is the least significant bit
+        Returns:
+            tuple: k-bit data words (0 for uncorrectable words)
+                and array("b") of result codes (see RESULT_CODES)
+        """
+        width = self.total_bits + 1
+        word_bytes = (width + 7) // 8
+        typecode = next((c for c in "BHILQ" if array(c).itemsize == word_bytes), None)
+        if typecode is not None:
+            # Let array convert the words in C, then make them big-endian
+            packed = array(typecode, words)
+            if sys.byteorder == "little":
+                packed.byteswap()
+            raw = packed.tobytes()
+        else:
+            raw = b"".join(word.to_bytes(word_bytes, "big") for word in words)
+        count = len(raw) // word_bytes
+        if count == 0:
+            return [], array("b")
+        ones = int.from_bytes(b"\x01" * count, "little")
+
+        # Bit plane of every codeword bit, the first bit of the word comes first
+        columns = [raw[i::word_bytes] for i in range(word_bytes)]
+        offset = word_bytes * 8 - width
+        planes = [
+            int.from_bytes(
+                columns[(offset + i) // 8].translate(_BIT_TABLES[(offset + i) % 8]),
+                "little",
+            )
+            for i in range(width)
+        ]
+
+        parity_odd = 0
+        for plane in planes:
+            parity_odd ^= plane
+
+        h = self.h
+        syndrome = []
+        nonzero = 0
+        for row in h:
+            bits = 0
+            for plane, bit in zip(planes, row):
+                if bit:
+                    bits ^= plane
+            syndrome.append(bits)
+            nonzero |= bits
+
+        # Match the syndrome against every column of H, like __find_error_positions()
+        matches = []
+        corrected_any = 0
+        for column in range(self.total_bits):
+            match = parity_odd
+            for bits, row in zip(syndrome, h):
+                match &= bits if row[column] else bits ^ ones
+            matches.append(match)
+            corrected_any |= match
+
+        uncorrectable = nonzero & (corrected_any ^ ones)
+        corrected = parity_odd & (uncorrectable ^ ones)
+        status = array("b")
+        status.frombytes((corrected | (uncorrectable << 1)).to_bytes(count, "little"))
+
+        # Assemble the corrected data bits, 8 bits per byte of the data word
+        data_bytes = (self.data_bits + 7) // 8
+        offset = data_bytes * 8 - self.data_bits
+        keep = uncorrectable ^ ones
+        lanes = [0] * data_bytes
+        for bit in range(self.data_bits):
+            lanes[(offset + bit) // 8] |= ((planes[bit] ^ matches[bit]) & keep) << (
+                7 - (offset + bit) % 8
+            )
+        out = bytearray(count * data_bytes)
+        for i, lane in enumerate(lanes):
+            out[i::data_bytes] = lane.to_bytes(count, "little")
+
+        if data_bytes == 1:
+            return list(out), status
+        return [
+            int.from_bytes(out[i : i + data_bytes], "big")
+            for i in range(0, len(out), data_bytes)
+        ], status
+
+    def decode_batch(self, words: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Checks many channel alphabet words at once and attempts to decode them. Requires NumPy.
+
+        Args:
+            words (ndarray): N x (n+1) array of codeword bits
+        Returns:
+            tuple: N x k array of data bits (all zero for uncorrectable rows)
+                and N array of result codes (see RESULT_CODES)
+        """
+        np = _numpy("decode_batch")
+        words = np.asarray(words, dtype=np.uint8).reshape(-1, self.total_bits + 1)
+        parity_odd = (words.sum(axis=1, dtype=np.uint8) & 1).astype(bool)
+        x = words[:, :-1].copy()
+
+        syndrome_bits = (x @ np.array(self.h, dtype=np.uint8).T) & 1
+        weights = 1 << np.arange(self.parity_bits - 1, -1, -1)
+        syndrome = syndrome_bits.astype(np.intp) @ weights
+        positions = np.array(self.__error_positions, dtype=np.intp)[syndrome]
+
+        # Flip the bit at the position of the matching column of H
+        correctable = parity_odd & (syndrome != 0) & (positions >= 0)
+        rows = np.flatnonzero(correctable)
+        x[rows, positions[rows]] ^= 1
+
+        uncorrectable = (syndrome != 0) & ~correctable
+        status = np.full(len(words), RESULT_CODES[HCResult.VALID], dtype=np.int8)
+        status[parity_odd] = RESULT_CODES[HCResult.CORRECTED]
+        status[uncorrectable] = RESULT_CODES[HCResult.UNCORRECTABLE]
+
+        data = x[:, : self.data_bits]
+        data[uncorrectable] = 0
+        return data, status
+
+    def __get_codebook(self) -> Tuple[int, ...]:
+        """
+        Returns all 2^k codewords, indexed by their data word. Built once per code.
+
+        Raises:
+            ValueError: If the code has more than MAX_SOFT_DATA_BITS data bits
+        """
+        if self.data_bits > MAX_SOFT_DATA_BITS:
+            raise ValueError(
+                f"Soft decoding supports at most {MAX_SOFT_DATA_BITS} data bits"
             )
-            # get the positions of the 1s in the mask
-            error_positions = tuple(i for i, v in enumerate(error_position_mask) if v == 1)
-            # if there are no error positions or more than 1, the error is uncorrectable
-            if(len(error_positions) != 1):
-                return None, HCResult.UNCORRECTABLE
-            # if there is exactly one error position, flip the bit at that position
-            encoded_word = tuple(
-                bit ^ (1 if i == error_positions[0] else 0)
-                for i, bit in enumerate(encoded_word)
+        codebook = self.__shared.codebook
+        if codebook is None:
+            with _registry_lock:
+                # Another thread may have built it in the meantime
+                codebook = self.__shared.codebook
+                if codebook is None:
+                    codebook = tuple(
+                        self.encode_int(data) for data in range(1 << self.data_bits)
+                    )
+                    self.__shared.codebook = codebook
+        return codebook
+
+    def decode_soft(self, llrs: Iterable[float]) -> SoftDecodeResult:
+        """
+        Finds the most likely codeword for the given bit confidences by correlating them with
+        every codeword in the codebook (maximum likelihood decoding).
+
+        Args:
+            llrs (iterable): n+1 log-likelihood ratios log(P(0) / P(1)), positive values favour 0
+        Returns:
+            tuple: (m-tuple, HCResult, margin) or (None, HCResult.UNCORRECTABLE, 0.0) if several
+                codewords are equally likely. The result is VALID if the hard decision of every
+                bit matches the codeword and CORRECTED otherwise. The margin is the
+                log-likelihood ratio of the best codeword to the runner-up.
+        Raises:
+            ValueError: If the number of values is wrong or the code is too large
+        """
+        width = self.total_bits + 1
+        llrs = tuple(float(llr) for llr in llrs)
+        if len(llrs) != width:
+            raise ValueError(f"Expected {width} values, got {len(llrs)}")
+        codebook = self.__get_codebook()
+
+        # The correlation with the bipolar codeword (+1 for 0 bits, -1 for 1 bits)
+        # starts at the sum of all values and drops for every 1 bit
+        total = sum(llrs)
+        best = second = float("-inf")
+        best_data = 0
+        for data, word in enumerate(codebook):
+            score = total
+            while word:
+                low = word & -word
+                score -= 2 * llrs[width - low.bit_length()]
+                word ^= low
+            if score > best:
+                best, second, best_data = score, best, data
+            elif score > second:
+                second = score
+
+        margin = (best - second) / 2
+        if margin <= 0:
+            return None, HCResult.UNCORRECTABLE, 0.0
+        hard = 0
+        for llr in llrs:
+            hard = (hard << 1) | (llr < 0)
+        result = HCResult.VALID if codebook[best_data] == hard else HCResult.CORRECTED
+        return _int_to_bits(best_data, self.data_bits), result, margin
+
+    def decode_soft_batch(
+        self, llrs: "np.ndarray"
+    ) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """
+        Decodes many words like decode_soft() with one matrix product. Requires NumPy.
+
+        Args:
+            llrs (ndarray): N x (n+1) array of log-likelihood ratios, positive values favour 0
+        Returns:
+            tuple: N x k array of data bits (all zero for uncorrectable rows),
+                N array of result codes (see RESULT_CODES) and N array of margins
+        Raises:
+            ValueError: If the code has more than MAX_SOFT_DATA_BITS data bits
+        """
+        np = _numpy("decode_soft_batch")
+        width = self.total_bits + 1
+        llrs = np.asarray(llrs, dtype=np.float64).reshape(-1, width)
+        codewords = np.array(self.__get_codebook(), dtype=np.int64)
+        bits = (codewords[:, None] >> np.arange(width - 1, -1, -1)) & 1
+
+        scores = llrs @ (1 - 2 * bits).T
+        best = scores.argmax(axis=1)
+        # There are at least two codewords, since k >= 1
+        top = np.partition(scores, -2, axis=1)
+        margin = (top[:, -1] - top[:, -2]) / 2
+
+        hard = (llrs < 0).astype(np.int64) @ (1 << np.arange(width - 1, -1, -1))
+        uncorrectable = margin <= 0
+        status = np.where(
+            codewords[best] == hard,
+            RESULT_CODES[HCResult.VALID],
+            RESULT_CODES[HCResult.CORRECTED],
+        ).astype(np.int8)
+        status[uncorrectable] = RESULT_CODES[HCResult.UNCORRECTABLE]
+        margin[uncorrectable] = 0
+
+        data = ((best[:, None] >> np.arange(self.data_bits - 1, -1, -1)) & 1).astype(
+            np.uint8
+        )
+        data[uncorrectable] = 0
+        return data, status, margin
+
+    def encode_stream(
+        self, source: ByteSource, chunk_size: int = 1 << 16, interleave_depth: int = 1
+    ) -> Iterator[bytes]:
+        """
+        Encodes a byte stream. The data is split into k-bit words (most significant bit first)
+        and the (n+1)-bit codewords are packed densely. The end of the data is marked by a
+        single 1 bit followed by zeros up to the end of the last word, so decode_stream()
+        restores the exact input for every code. For the (10, 6) code every 6 data bytes
+        become 11 bytes of codewords.
+
+        Args:
+            source (bytes, file or iterable): Data to encode
+            chunk_size (int): Approximate number of bytes read at once
+            interleave_depth (int): Number of codewords interleaved by interleave(),
+                1 disables interleaving
+        Returns:
+            iterator: Chunks of packed codewords
+        """
+        unit_bytes = self.chunk_words(interleave_depth) * self.data_bits // 8
+        chunks = _iter_chunks(source, max(1, chunk_size // unit_bytes) * unit_bytes)
+        # Only the last chunk can contain a partial block and gets the end marker
+        chunk = next(chunks, b"")
+        for next_chunk in chunks:
+            yield self.encode_chunk(chunk, False, interleave_depth)
+            chunk = next_chunk
+        yield self.encode_chunk(chunk, True, interleave_depth)
+
+    def decode_stream(
+        self,
+        source: ByteSource,
+        chunk_size: int = 1 << 16,
+        strict: bool = True,
+        interleave_depth: int = 1,
+    ) -> Iterator[bytes]:
+        """
+        Decodes a stream of packed codewords created by encode_stream().
+
+        Args:
+            source (bytes, file or iterable): Packed codewords
+            chunk_size (int): Approximate number of bytes read at once
+            strict (bool): Raise on uncorrectable codewords instead of decoding them as zeros
+            interleave_depth (int): interleave_depth passed to encode_stream()
+        Raises:
+            ValueError: If strict and a codeword is uncorrectable or if the end marker is missing
+        Returns:
+            iterator: Chunks of decoded data
+        """
+        unit_bytes = self.chunk_words(interleave_depth) * (self.total_bits + 1) // 8
+        chunks = _iter_chunks(source, max(1, chunk_size // unit_bytes) * unit_bytes)
+        index = 0
+        chunk = next(chunks, b"")
+        for next_chunk in chunks:
+            yield self.decode_chunk(chunk, False, strict, interleave_depth, index)
+            index += len(chunk) * 8 // (self.total_bits + 1)
+            chunk = next_chunk
+        yield self.decode_chunk(chunk, True, strict, interleave_depth, index)
+
+    def chunk_words(self, interleave_depth: int = 1) -> int:
+        """
+        Returns the number of codewords every chunk of a stream but the last is a multiple of.
+
+        Args:
+            interleave_depth (int): Interleave depth of the stream
+        Raises:
+            ValueError: If the interleave depth is less than 1
+        Returns:
+            int: Multiple of block_words and interleave_depth
+        """
+        if interleave_depth < 1:
+            raise ValueError("The interleave depth has to be at least 1")
+        return math.lcm(self.block_words, interleave_depth)
+
+    def encode_chunk(
+        self, chunk: bytes, final: bool = True, interleave_depth: int = 1
+    ) -> bytes:
+        """
+        Encodes one chunk of a stream like encode_stream(), without keeping any state.
+
+        Args:
+            chunk (bytes-like): Data, a multiple of chunk_words() words unless final
+            final (bool): Last chunk of the stream, followed by the end marker
+            interleave_depth (int): Number of codewords interleaved by interleave()
+        Raises:
+            ValueError: If a chunk that is not final contains a partial block or group
+        Returns:
+            bytes: Packed codewords
+        """
+        if not final and len(chunk) * 8 % (
+            self.chunk_words(interleave_depth) * self.data_bits
+        ):
+            raise ValueError("Only the final chunk can contain a partial block")
+        return self.interleave(
+            self.__encode_chunk(chunk, final), interleave_depth, final
+        )
+
+    def decode_chunk(
+        self,
+        chunk: bytes,
+        final: bool = True,
+        strict: bool = True,
+        interleave_depth: int = 1,
+        index: int = 0,
+    ) -> bytes:
+        """
+        Decodes one chunk of a stream like decode_stream(), without keeping any state.
+
+        Args:
+            chunk (bytes-like): Packed codewords, a multiple of chunk_words() words unless final
+            final (bool): Last chunk of the stream, which contains the end marker
+            strict (bool): Raise on uncorrectable codewords instead of decoding them as zeros
+            interleave_depth (int): interleave_depth passed to encode_stream()
+            index (int): Number of codewords before the chunk, used in error messages
+        Raises:
+            ValueError: If strict and a codeword is uncorrectable, if the end marker is missing
+                or if a chunk that is not final contains a partial block or group
+        Returns:
+            bytes: Decoded data
+        """
+        block_bytes = self.block_words * (self.total_bits + 1) // 8
+        data_bytes = self.block_words * self.data_bits // 8
+        out = bytearray(-(-len(chunk) // block_bytes) * data_bytes)
+        chunk = self.deinterleave(chunk, interleave_depth, final)
+        size = self.__decode_into(chunk, out, None, index, strict, final)
+        return bytes(out[:size])
+
+    def interleave(self, packed: bytes, depth: int, final: bool = True) -> bytes:
+        """
+        Block interleaver for packed codewords. Every group of depth codewords is written row
+        by row into a depth x (n+1) bit matrix and read column by column, so a burst of up to
+        depth adjacent bit errors on the channel hits every codeword at most once.
+        Only one group is processed at a time.
+
+        Args:
+            packed (bytes-like): Packed codewords as created by encode_stream(interleave_depth=1)
+            depth (int): Number of codewords per group, 1 returns the input unchanged
+            final (bool): packed contains the end of the stream, where the last group may be
+                shorter and the padding bits are kept in place. Otherwise the number of
+                codewords has to be a multiple of depth.
+        Raises:
+            ValueError: If not final and packed does not consist of whole groups
+        Returns:
+            bytes: Interleaved codewords of the same length
+        """
+        return self.__interleave_bits(packed, depth, final, False)
+
+    def deinterleave(self, packed: bytes, depth: int, final: bool = True) -> bytes:
+        """
+        Reverses interleave() with the same depth and final flag.
+
+        Args:
+            packed (bytes-like): Interleaved codewords
+            depth (int): Number of codewords per group
+            final (bool): packed contains the end of the stream
+        Raises:
+            ValueError: If not final and packed does not consist of whole groups
+        Returns:
+            bytes: Packed codewords in their original order
+        """
+        return self.__interleave_bits(packed, depth, final, True)
+
+    def __interleave_bits(
+        self, packed: bytes, depth: int, final: bool, inverse: bool
+    ) -> bytes:
+        """
+        Transposes (or with inverse, transposes back) the bit matrix of every group of depth
+        codewords. Only the bits of one group are held as a string of "0" and "1" at a time,
+        so every row and column is a single slice, the results are collected in whole bytes.
+        """
+        if depth < 1:
+            raise ValueError("The interleave depth has to be at least 1")
+        if depth == 1 or not packed:
+            return bytes(packed)
+        width = self.total_bits + 1
+        view = memoryview(packed).cast("B")
+        total = len(view) * 8
+        words = total // width
+        if not final and (words % depth or total % width):
+            raise ValueError("Only the final chunk can contain a partial group")
+
+        out = bytearray()
+        pending, pending_bits = 0, 0
+        for start in range(0, words, depth):
+            rows = min(depth, words - start)
+            first, last = start * width, (start + rows) * width
+            value = int.from_bytes(view[first // 8 : -(-last // 8)], "big")
+            value >>= -last % 8
+            group = format(value & ((1 << (rows * width)) - 1), f"0{rows * width}b")
+            if inverse:
+                group = "".join([group[i::rows] for i in range(rows)])
+            else:
+                group = "".join([group[i::width] for i in range(width)])
+            pending = (pending << (rows * width)) | int(group, 2)
+            pending_bits += rows * width
+            whole = pending_bits // 8
+            pending_bits -= whole * 8
+            out += (pending >> pending_bits).to_bytes(whole, "big")
+            pending &= (1 << pending_bits) - 1
+        # Padding bits after the last codeword stay where they are
+        padding = total - words * width
+        if padding:
+            tail = int.from_bytes(view[len(view) - (padding + 7) // 8 :], "big")
+            pending = (pending << padding) | (tail & ((1 << padding) - 1))
+            pending_bits += padding
+        out += pending.to_bytes(pending_bits // 8, "big")
+        return bytes(out)
+
+    def __encode_chunk(self, chunk: bytes, final: bool) -> bytes:
+        """
+        Encodes whole blocks of data. The final chunk may end with a partial block
+        and is followed by the end marker.
+        """
+        k, width = self.data_bits, self.total_bits + 1
+        data_mask = (1 << k) - 1
+        block_bytes = self.block_words * k // 8
+        code_bytes = self.block_words * width // 8
+        shifts = range(k * (self.block_words - 1), -1, -k)
+        encode = self.encode_int
+
+        out = bytearray()
+        full = len(chunk) - len(chunk) % block_bytes
+        for start in range(0, full, block_bytes):
+            value = int.from_bytes(chunk[start : start + block_bytes], "big")
+            packed = 0
+            for shift in shifts:
+                packed = (packed << width) | encode((value >> shift) & data_mask)
+            out += packed.to_bytes(code_bytes, "big")
+
+        if final:
+            # Append the end marker and fill the last word with zeros
+            bits = (len(chunk) - full) * 8 + 1
+            words = -(-bits // k)
+            value = ((int.from_bytes(chunk[full:], "big") << 1) | 1) << (
+                words * k - bits
             )
-            return encoded_word[:self.data_bits], HCResult.CORRECTED
+            packed = 0
+            for shift in range(k * (words - 1), -1, -k):
+                packed = (packed << width) | encode((value >> shift) & data_mask)
+            tail_bytes = -(-words * width // 8)
+            packed <<= tail_bytes * 8 - words * width
+            out += packed.to_bytes(tail_bytes, "big")
+        return bytes(out)
+
+    def __decode_into(
+        self,
+        src: bytes,
+        out: Union[bytearray, memoryview],
+        status: Union[None, array, bytearray, memoryview],
+        index: int,
+        strict: bool,
+        final: bool,
+    ) -> int:
+        """
+        Decodes whole blocks of packed codewords into out and writes the result code of every
+        codeword into status (if not None). If final, the last block may be partial and ends
+        with the end marker. index is the number of codewords before src, used for error messages.
+        Returns the number of bytes written to out.
+        """
+        k, width = self.data_bits, self.total_bits + 1
+        word_mask = (1 << width) - 1
+        block_bytes = self.block_words * width // 8
+        data_bytes = self.block_words * k // 8
+        decode = self.decode_int
+        valid = HCResult.VALID
+        uncorrectable = RESULT_CODES[HCResult.UNCORRECTABLE]
+
+        def unpack(value: int, words: int, index: int) -> int:
+            data = 0
+            for shift in range(width * (words - 1), -1, -width):
+                word, result = decode((value >> shift) & word_mask)
+                if word is None:
+                    if strict:
+                        raise ValueError(f"Uncorrectable codeword at index {index}")
+                    word = 0
+                    if status is not None:
+                        status[index] = uncorrectable
+                elif status is not None:
+                    status[index] = 0 if result is valid else 1
+                data = (data << k) | word
+                index += 1
+            return data
+
+        if not final:
+            if len(src) % block_bytes:
+                raise ValueError("Only the final chunk can contain a partial block")
+            full = len(src)
         else:
-            raise Exception("This should never happen")
+            # The last block (which may be partial) contains the end marker
+            full = max(0, len(src) - 1) // block_bytes * block_bytes
+
+        position = 0
+        for start in range(0, full, block_bytes):
+            value = int.from_bytes(src[start : start + block_bytes], "big")
+            data = unpack(value, self.block_words, index)
+            out[position : position + data_bytes] = data.to_bytes(data_bytes, "big")
+            position += data_bytes
+            index += self.block_words
+
+        if final and len(src) > full:
+            tail = len(src) - full
+            words = tail * 8 // width
+            value = int.from_bytes(src[full:], "big") >> (tail * 8 - words * width)
+            data = unpack(value, words, index)
+            # Strip the trailing zeros and the marker bit, which fill at most one data
+            # word and end the data on a byte boundary, unless the tail is damaged
+            padding = (data & -data).bit_length()
+            if not 1 <= padding <= k or (words * k - padding) % 8:
+                raise ValueError("End of stream marker is missing")
+            tail_bytes = (words * k - padding) // 8
+            out[position : position + tail_bytes] = (data >> padding).to_bytes(
+                tail_bytes, "big"
+            )
+            position += tail_bytes
+        return position
+
+    def decode_buffer(
+        self,
+        src: bytes,
+        out: Union[bytearray, memoryview],
+        status: Union[None, array, bytearray, memoryview] = None,
+        final: bool = True,
+    ) -> int:
+        """
+        Decodes packed codewords created by encode_stream() into a preallocated buffer,
+        uncorrectable codewords are decoded as zeros.
+
+        Args:
+            src (bytes-like): Packed codewords
+            out (bytes-like): Writable buffer of at least decoded_size(src) bytes
+            status (bytes-like): Writable buffer with one element per codeword for the
+                result codes (see RESULT_CODES) or None
+            final (bool): src contains the end of the stream, otherwise it has to consist
+                of whole blocks
+        Raises:
+            ValueError: If the end marker is missing
+        Returns:
+            int: Number of bytes written to out
+        """
+        return self.__decode_into(src, out, status, 0, False, final)
+
+    def decode_into(
+        self,
+        src: bytes,
+        dst: Union[bytearray, array, memoryview],
+        status: Union[None, array, bytearray, memoryview] = None,
+    ) -> Dict[HCResult, int]:
+        """
+        Decodes densely packed codewords (as in the blocks of encode_stream()) into
+        preallocated buffers with one data word per element, without creating result tuples.
+        Uncorrectable codewords are decoded as zeros. Bits after the last whole codeword
+        are ignored.
+
+        Args:
+            src (bytes-like): Packed codewords
+            dst (bytes-like): Writable buffer with one element per codeword for the data words,
+                e.g. bytearray or array("B") for up to 8 data bits
+            status (bytes-like): Writable buffer with one element per codeword for the
+                result codes (see RESULT_CODES), e.g. array("b"), or None
+        Raises:
+            ValueError: If dst or status are too small
+        Returns:
+            dict: Number of codewords per HCResult
+        """
+        width = self.total_bits + 1
+        words = len(src) * 8 // width
+        if len(dst) < words:
+            raise ValueError("Output buffer is too small")
+        if status is not None and len(status) < words:
+            raise ValueError("Status buffer is too small")
+
+        word_mask = (1 << width) - 1
+        block_bytes = self.block_words * width // 8
+        decode = self.decode_int
+        result_codes = RESULT_CODES
+        counts = [0] * len(RESULT_CODES)
+        index = 0
+
+        def unpack(value: int, count: int) -> None:
+            nonlocal index
+            for shift in range(width * (count - 1), -1, -width):
+                data, result = decode((value >> shift) & word_mask)
+                code = result_codes[result]
+                dst[index] = 0 if data is None else data
+                if status is not None:
+                    status[index] = code
+                counts[code] += 1
+                index += 1
+
+        with memoryview(src) as view:
+            full = words // self.block_words * block_bytes
+            for start in range(0, full, block_bytes):
+                unpack(
+                    int.from_bytes(view[start : start + block_bytes], "big"),
+                    self.block_words,
+                )
+            rest = words - index
+            if rest:
+                tail = len(view) - full
+                value = int.from_bytes(view[full:], "big") >> (tail * 8 - rest * width)
+                unpack(value, rest)
+        return {result: counts[code] for result, code in RESULT_CODES.items()}
+
+    def is_valid(self, word: Union[int, Tuple[int, ...]]) -> bool:
+        """
+        Checks whether the word is a codeword, without attempting to correct it.
+
+        Args:
+            word (int or tuple): Bit-packed (n+1)-bit word or (n+1)-tuple
+        Returns:
+            bool: True if the syndrome and the overall parity are zero
+        """
+        if not isinstance(word, int):
+            word = _bits_to_int(word)
+        if self.__decode_ints is not None:
+            return self.__decode_ints[word][1] is _VALID
+        if word.bit_count() & 1:
+            return False
+        # Every check of H has to see an even number of ones, stop at the first that does not
+        word >>= 1
+        for row in self.h_masks:
+            if (word & row).bit_count() & 1:
+                return False
+        return True
+
+    def iter_invalid_indices(self, src: bytes) -> Iterator[int]:
+        """
+        Yields the index of every packed codeword (as in decode_into()) that is not valid.
+
+        Args:
+            src (bytes-like): Packed codewords
+        Returns:
+            iterator: Indices of the words that need correction
+        """
+        width = self.total_bits + 1
+        index = 0
+        for value, words in self.__iter_packed(src):
+            flags = self.__invalid_flags(value, words)
+            if flags:
+                # Bit i * width marks the i-th word from the end, the first character
+                # of the string is the most significant bit
+                bits = format(flags, "b")
+                position = bits.find("1")
+                while position >= 0:
+                    yield index + words - 1 - (len(bits) - 1 - position) // width
+                    position = bits.find("1", position + 1)
+            index += words
+
+    def count_invalid(self, src: bytes) -> int:
+        """
+        Counts the packed codewords (as in decode_into()) that are not valid.
+
+        Args:
+            src (bytes-like): Packed codewords
+        Returns:
+            int: Number of words that need correction
+        """
+        return sum(
+            self.__invalid_flags(value, words).bit_count()
+            for value, words in self.__iter_packed(src)
+        )
+
+    def __iter_packed(
+        self, src: bytes, chunk_size: int = 1 << 16
+    ) -> Iterator[Tuple[int, int]]:
+        """
+        Splits packed codewords into chunks of whole blocks and yields every chunk as a single
+        integer (the last word is the least significant) along with its number of words.
+        Bits after the last whole codeword are dropped.
+        """
+        width = self.total_bits + 1
+        block_bytes = self.block_words * width // 8
+        chunk_bytes = max(1, chunk_size // block_bytes) * block_bytes
+        with memoryview(src) as view:
+            for start in range(0, len(view), chunk_bytes):
+                chunk = view[start : start + chunk_bytes]
+                words = len(chunk) * 8 // width
+                if words:
+                    value = int.from_bytes(chunk, "big")
+                    yield value >> (len(chunk) * 8 - words * width), words
+
+    def __invalid_flags(self, value: int, words: int) -> int:
+        """
+        Checks all packed words at once with a few operations on the whole integer.
+
+        Every check (the rows of H and the overall parity) is applied to the even and the odd
+        words separately. The bits of each masked word are then XOR-folded into its lowest
+        bit, and the empty word above each one keeps the folds from mixing words.
+
+        Returns:
+            int: Bit i * width is set if the i-th word from the end is not valid
+        """
+        width = self.total_bits + 1
+        # Lowest bit of every second word, built by doubling
+        every_other = 1
+        count = 1
+        while count < (words + 1) // 2:
+            every_other |= every_other << (2 * width * count)
+            count *= 2
+        every_other &= (1 << (words * width)) - 1
+        shifts = []
+        shift = 1
+        while shift < width:
+            shifts.append(shift)
+            shift *= 2
+
+        checks = [row << 1 for row in self.h_masks] + [(1 << width) - 1]
+        flags = 0
+        for lowest in (every_other, every_other << width):
+            for check in checks:
+                bits = value & (lowest * check)
+                for shift in shifts:
+                    bits ^= bits >> shift
+                flags |= bits & lowest
+        return flags
+
+    def decoded_size(self, src: bytes) -> int:
+        """
+        Returns the number of data bytes stored in a complete stream of packed codewords.
+        Only the last block is decoded to find the end marker.
+
+        Args:
+            src (bytes-like): Output of encode_stream()
+        Raises:
+            ValueError: If the end marker is missing
+        Returns:
+            int: Length of the decoded data
+        """
+        block_bytes = self.block_words * (self.total_bits + 1) // 8
+        data_bytes = self.block_words * self.data_bits // 8
+        last = max(0, len(src) - 1) // block_bytes * block_bytes
+        # Copy the last block, a slice of a memory-mapped src would otherwise stay exported
+        # while an exception unwinds and keep the map from being closed
+        tail = self.__decode_into(
+            bytes(src[last:]), bytearray(data_bytes), None, 0, False, True
+        )
+        return last // block_bytes * data_bytes + tail
+
+    def incremental(self) -> "IncrementalDecoder":
+        """
+        Returns a decoder for words that arrive one bit at a time (see IncrementalDecoder).
+        """
+        return IncrementalDecoder(self)
+
+    def decode_file(
+        self,
+        path: str,
+        out: Union[None, bytearray, mmap.mmap] = None,
+        status: Union[None, array, bytearray] = None,
+    ) -> Tuple[Union[bytearray, mmap.mmap], Union[array, bytearray]]:
+        """
+        Decodes a file of packed codewords created by encode_stream(). The file is memory-mapped
+        and decoded straight into out, uncorrectable codewords are decoded as zeros.
+
+        Args:
+            path (str): File of packed codewords
+            out (bytearray or mmap): Writable buffer of at least decoded_size() bytes,
+                allocated if None
+            status (array or bytearray): Writable buffer with one element per codeword for the
+                result codes (see RESULT_CODES), allocated as array("b") if None
+        Raises:
+            ValueError: If out or status are too small or if the end marker is missing
+        Returns:
+            tuple: (out, status)
+        """
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            words = size * 8 // (self.total_bits + 1)
+            if status is None:
+                status = array("b", bytes(words))
+            if len(status) < words:
+                raise ValueError("Status buffer is too small")
+            if size == 0:
+                # Empty files can not be mapped
+                return (bytearray() if out is None else out), status
+
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as src:
+                with memoryview(src) as src_view:
+                    decoded_size = self.decoded_size(src_view)
+                    if out is None:
+                        out = bytearray(decoded_size)
+                    if len(out) < decoded_size:
+                        raise ValueError("Output buffer is too small")
+                    with memoryview(out) as out_view:
+                        self.decode_buffer(src_view, out_view, status)
+        return out, status
+
+
+class IncrementalDecoder:
+    """
+    Decodes a codeword that arrives one bit at a time. The syndrome and the overall parity
+    are updated with every bit, so only a table lookup is left after the last bit.
+    """
+
+    def __init__(self, code: HammingCode):
+        """
+        Precomputes the column syndromes of H and the outcome of every syndrome.
+
+        Args:
+            code (HammingCode): Code of the received words
+        """
+        self.total_bits = code.total_bits
+        self.data_bits = code.data_bits
+        self.parity_bits = code.parity_bits
+
+        # Syndrome of a single 1 bit at every position of the n-bit word
+        self.columns: Tuple[int, ...] = tuple(
+            sum(
+                ((row >> (self.total_bits - 1 - i)) & 1) << (self.parity_bits - 1 - j)
+                for j, row in enumerate(code.h_masks)
+            )
+            for i in range(self.total_bits)
+        )
+        positions = {column: i for i, column in enumerate(self.columns)}
+
+        # Bits to flip in the n-bit word (None if uncorrectable) and result,
+        # indexed by the syndrome followed by the overall parity bit
+        outcomes = []
+        for syndrome in range(1 << self.parity_bits):
+            if syndrome == 0:
+                outcomes.append((0, HCResult.VALID))
+                outcomes.append((0, HCResult.CORRECTED))
+            else:
+                outcomes.append((None, HCResult.UNCORRECTABLE))
+                position = positions.get(syndrome)
+                if position is None:
+                    outcomes.append((None, HCResult.UNCORRECTABLE))
+                else:
+                    flip = 1 << (self.total_bits - 1 - position)
+                    outcomes.append((flip, HCResult.CORRECTED))
+        self.outcomes: Tuple[Tuple[Union[None, int], HCResult], ...] = tuple(outcomes)
+
+        # Data tuples of small codes are looked up instead of being built
+        self.data_words: Union[None, Tuple[Tuple[int, ...], ...]] = None
+        if self.data_bits <= MAX_TABLE_BITS:
+            self.data_words = tuple(
+                _int_to_bits(data, self.data_bits)
+                for data in range(1 << self.data_bits)
+            )
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Discards the bits of the current word.
+        """
+        # Number of bits received of the current word
+        self.position = 0
+        self.syndrome = 0
+        self.parity = 0
+        # Received n-bit word without the overall parity bit
+        self.word = 0
+
+    def push(self, bit: int) -> Union[None, DecodeResult]:
+        """
+        Adds the next bit of the current word, the overall parity bit comes last.
+
+        Args:
+            bit (int): 0 or 1
+        Returns:
+            Union: None until the word is complete, then the result of HammingCode.decode()
+                and the decoder starts over with the next word
+        """
+        position = self.position
+        if position < self.total_bits:
+            self.word = (self.word << 1) | bit
+            if bit:
+                self.syndrome ^= self.columns[position]
+                self.parity ^= 1
+            self.position = position + 1
+            return None
+
+        flip, result = self.outcomes[(self.syndrome << 1) | (self.parity ^ bit)]
+        word = self.word
+        self.reset()
+        if flip is None:
+            return None, result
+        data = (word ^ flip) >> self.parity_bits
+        if self.data_words is not None:
+            return self.data_words[data], result
+        return _int_to_bits(data, self.data_bits), result
+
+
+# Per process state of the parallel_decode() workers
+_worker_code: Union[None, HammingCode] = None
+_worker_memory: List["shared_memory.SharedMemory"] = []
+
+
+def _parallel_init(names: Tuple[str, str, str], kwargs: Dict) -> None:
+    """
+    Builds the HammingCode and attaches the shared memory blocks once per worker process.
+    """
+    global _worker_code, _worker_memory
+    from multiprocessing import shared_memory
+
+    _worker_code = HammingCode(**kwargs)
+    _worker_memory = [shared_memory.SharedMemory(name=name) for name in names]
+
+
+def _parallel_decode_chunk(task: Tuple[int, int, int, int, bool]) -> None:
+    """
+    Decodes src[start:end] in place into out at out_start and status at status_start.
+    """
+    start, end, out_start, status_start, final = task
+    src, out, status = (memory.buf for memory in _worker_memory)
+    status_end = status_start + (end - start) * 8 // (_worker_code.total_bits + 1)
+    _worker_code.decode_buffer(
+        src[start:end], out[out_start:], status[status_start:status_end], final
+    )
+
+
+def parallel_decode(
+    source: Union[bytes, bytearray, memoryview],
+    workers: Union[None, int] = None,
+    chunks_per_worker: int = 4,
+    **kwargs,
+) -> Tuple[bytes, array]:
+    """
+    Decodes packed codewords created by HammingCode.encode_stream() with a pool of processes.
+    The codewords, the decoded data and the result codes live in shared memory, every worker
+    decodes whole blocks at fixed offsets, so the result does not depend on scheduling.
+
+    Args:
+        source (bytes-like): Packed codewords
+        workers (int): Number of worker processes, defaults to the number of CPUs
+        chunks_per_worker (int): Number of chunks per worker for load balancing
+        kwargs: Arguments for HammingCode()
+    Raises:
+        ValueError: If the end marker is missing
+    Returns:
+        tuple: Decoded data (uncorrectable codewords as zeros)
+            and array("b") of result codes (see RESULT_CODES)
+    """
+    # Imported here, multiprocessing is slow to import and only needed by this function
+    import multiprocessing
+    from multiprocessing import shared_memory
+
+    code = HammingCode(**kwargs)
+    width = code.total_bits + 1
+    src_view = memoryview(source).cast("B")
+    size = len(src_view)
+    if size == 0:
+        return b"", array("b")
+    words = size * 8 // width
+    decoded_size = code.decoded_size(src_view)
+
+    workers = workers or os.cpu_count() or 1
+    block_bytes = code.block_words * width // 8
+    data_bytes = code.block_words * code.data_bits // 8
+    blocks = -(-size // block_bytes)
+    chunk_blocks = -(-blocks // (workers * chunks_per_worker))
+    tasks = []
+    for block in range(0, blocks, chunk_blocks):
+        start = block * block_bytes
+        end = min(size, start + chunk_blocks * block_bytes)
+        tasks.append(
+            (start, end, block * data_bytes, block * code.block_words, end == size)
+        )
+
+    # The output gets room for a whole last block, the end marker is stripped afterwards
+    memory = [
+        shared_memory.SharedMemory(create=True, size=max(1, n))
+        for n in (size, blocks * data_bytes, words)
+    ]
+    try:
+        memory[0].buf[:size] = src_view
+        with multiprocessing.Pool(
+            min(workers, len(tasks)),
+            initializer=_parallel_init,
+            initargs=(tuple(m.name for m in memory), kwargs),
+        ) as pool:
+            pool.map(_parallel_decode_chunk, tasks)
+        status = array("b")
+        status.frombytes(memory[2].buf[:words])
+        return bytes(memory[1].buf[:decoded_size]), status
+    finally:
+        for m in memory:
+            m.close()
+            m.unlink()
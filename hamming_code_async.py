@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+"""
+asyncio adapters for the streams of hamming_code.py.
+
+The chunks are encoded and decoded in an executor, so the event loop keeps running while
+a chunk is processed. Only one chunk is read ahead, so a slow consumer or a full writer
+slows down the reading side as well.
+"""
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import AsyncIterable, AsyncIterator, Callable, Dict, Tuple, Union
+
+from hamming_code import HammingCode
+
+AsyncByteSource = Union[asyncio.StreamReader, AsyncIterable[bytes]]
+
+
+def _encode_chunk(
+    params: Tuple[int, int], options: Dict, chunk: bytes, final: bool, depth: int
+) -> bytes:
+    """
+    Encodes a chunk with the code given by its parameters and constructor options, so it can
+    run in a process pool. The code is looked up in the registry of the executing process.
+    """
+    return HammingCode(*params, **options).encode_chunk(chunk, final, depth)
+
+
+def _decode_chunk(
+    params: Tuple[int, int],
+    options: Dict,
+    chunk: bytes,
+    final: bool,
+    strict: bool,
+    depth: int,
+    index: int,
+) -> bytes:
+    """
+    Decodes a chunk with the code given by its parameters and constructor options, so it
+    can run in a process pool. Statistics are recorded in the executing process only.
+    """
+    return HammingCode(*params, **options).decode_chunk(
+        chunk, final, strict, depth, index
+    )
+
+
+def _chunk_function(
+    code: HammingCode, executor: Union[None, Executor], encode: bool
+) -> Callable:
+    """
+    Returns the function that encodes or decodes chunks of code in executor: the bound
+    method for threads, so the settings and statistics of code are used, otherwise a
+    picklable function that creates an equivalent code in the worker process.
+    """
+    if isinstance(executor, ProcessPoolExecutor):
+        return partial(
+            _encode_chunk if encode else _decode_chunk,
+            (code.total_bits, code.data_bits),
+            code.options,
+        )
+    return code.encode_chunk if encode else code.decode_chunk
+
+
+async def _read_chunks(
+    source: AsyncByteSource, chunk_size: int
+) -> AsyncIterator[bytes]:
+    """
+    Yields the bytes of a StreamReader or an async iterable of byte strings.
+    """
+    if isinstance(source, asyncio.StreamReader):
+        while True:
+            data = await source.read(chunk_size)
+            if not data:
+                return
+            yield data
+    else:
+        async for data in source:
+            if data:
+                yield data
+
+
+async def decode_reader(
+    code: HammingCode,
+    reader: AsyncByteSource,
+    chunk_size: int = 1 << 16,
+    strict: bool = True,
+    interleave_depth: int = 1,
+    executor: Union[None, Executor] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Decodes packed codewords created by encode_stream() or encode_writer() from a reader.
+
+    Args:
+        code (HammingCode): Code of the stream
+        reader (StreamReader or async iterable): Packed codewords
+        chunk_size (int): Approximate number of bytes decoded at once
+        strict (bool): Raise on uncorrectable codewords instead of decoding them as zeros
+        interleave_depth (int): interleave_depth of the stream
+        executor (Executor): Executor for decoding, the default executor of the loop if None.
+            A ProcessPoolExecutor decodes with an equivalent code per worker process, then
+            code.stats is not updated.
+    Raises:
+        ValueError: If strict and a codeword is uncorrectable or if the end marker is missing
+    Returns:
+        async iterator: Chunks of decoded data
+    """
+    loop = asyncio.get_running_loop()
+    decode = _chunk_function(code, executor, False)
+    width = code.total_bits + 1
+    unit_bytes = code.chunk_words(interleave_depth) * width // 8
+    chunk_size = max(1, chunk_size // unit_bytes) * unit_bytes
+
+    buffer = bytearray()
+    index = 0
+    async for data in _read_chunks(reader, chunk_size):
+        buffer += data
+        # Keep at least one byte back, the final chunk contains the end marker
+        usable = min(chunk_size, (len(buffer) - 1) // unit_bytes * unit_bytes)
+        while usable:
+            chunk = bytes(buffer[:usable])
+            del buffer[:usable]
+            yield await loop.run_in_executor(
+                executor,
+                decode,
+                chunk,
+                False,
+                strict,
+                interleave_depth,
+                index,
+            )
+            index += usable * 8 // width
+            usable = min(chunk_size, (len(buffer) - 1) // unit_bytes * unit_bytes)
+
+    yield await loop.run_in_executor(
+        executor,
+        decode,
+        bytes(buffer),
+        True,
+        strict,
+        interleave_depth,
+        index,
+    )
+
+
+async def encode_writer(
+    code: HammingCode,
+    source: AsyncByteSource,
+    writer: asyncio.StreamWriter,
+    chunk_size: int = 1 << 16,
+    interleave_depth: int = 1,
+    executor: Union[None, Executor] = None,
+) -> int:
+    """
+    Encodes the data of a reader like encode_stream() and writes the packed codewords into
+    writer. Every chunk is drained before the next one is encoded. The writer is not closed.
+
+    Args:
+        code (HammingCode): Code to use
+        source (StreamReader or async iterable): Data to encode
+        writer (StreamWriter): Destination of the packed codewords
+        chunk_size (int): Approximate number of data bytes encoded at once
+        interleave_depth (int): Number of codewords interleaved by HammingCode.interleave()
+        executor (Executor): Executor for encoding, the default executor of the loop if None.
+            A ProcessPoolExecutor encodes with an equivalent code per worker process.
+    Returns:
+        int: Number of bytes written
+    """
+    loop = asyncio.get_running_loop()
+    encode = _chunk_function(code, executor, True)
+    unit_bytes = code.chunk_words(interleave_depth) * code.data_bits // 8
+    chunk_size = max(1, chunk_size // unit_bytes) * unit_bytes
+
+    async def write(chunk: bytes, final: bool) -> int:
+        encoded = await loop.run_in_executor(
+            executor, encode, chunk, final, interleave_depth
+        )
+        writer.write(encoded)
+        await writer.drain()
+        return len(encoded)
+
+    buffer = bytearray()
+    written = 0
+    async for data in _read_chunks(source, chunk_size):
+        buffer += data
+        while len(buffer) >= chunk_size:
+            chunk = bytes(buffer[:chunk_size])
+            del buffer[:chunk_size]
+            written += await write(chunk, False)
+
+    written += await write(bytes(buffer), True)
+    return written
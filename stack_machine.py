@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 
+from collections.abc import MutableSequence
 from enum import IntEnum, Enum
-from typing import List, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, Tuple, Union
 from ctypes import c_ubyte
+from itertools import islice
 from math import factorial
 
 
@@ -43,6 +45,281 @@ class SMState(IntEnum):
     ERROR = -1
 
 
+# Bit tuples of all byte values (most significant bit first) and the reverse mapping
+_BYTE_TUPLES: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple((value >> i) & 1 for i in range(7, -1, -1)) for value in range(256)
+)
+_TUPLE_BYTES: Dict[Tuple[int, ...], int] = {
+    bits: value for value, bits in enumerate(_BYTE_TUPLES)
+}
+
+# Tags of the stack entries
+_BYTE = 0
+_CHAR = 1
+_OTHER = 2
+
+MAX_INT = 255
+
+# Overflow handling of the instructions: keep the flag, clear it before the handler runs,
+# clear it before and set it again if the result has to be wrapped around to fit into a
+# byte, or only set or clear it after the handler succeeded, depending on the wrap
+_KEEP_OVERFLOW = 0
+_CLEAR_OVERFLOW = 1
+_WRAP_OVERFLOW = 2
+_SET_OVERFLOW = 3
+
+
+class OperandStack(MutableSequence):
+    """
+    Operand stack of the stack machine. Bytes and characters are stored as raw bytes with a
+    tag each, any other item in a side store. Items are only converted to their observable
+    form (8-tuples of bits for bytes) when the stack is inspected, otherwise it behaves like
+    a list.
+    """
+
+    def __init__(self, items: Iterable = ()) -> None:
+        """
+        Initializes the stack with the given items.
+
+        Args:
+            items (iterable): Items from bottom to top
+        """
+        self._values = bytearray()
+        self._tags = bytearray()
+        # Items that are neither bytes nor characters, by position
+        self._others: Dict[int, Any] = {}
+        self.extend(items)
+
+    def push_byte(self, value: int) -> None:
+        """
+        Pushes a value from 0 to 255.
+        """
+        self._values.append(value)
+        self._tags.append(_BYTE)
+
+    def pop_operand(self) -> Union[int, str, Any]:
+        """
+        Pops the top item as operand: bytes and bit tuples as int, characters as str.
+
+        Raises:
+            IndexError: If the stack is empty
+        """
+        tag = self._tags.pop()
+        value = self._values.pop()
+        if tag == _BYTE:
+            return value
+        if tag == _CHAR:
+            return chr(value)
+        item = self._others.pop(len(self._values))
+        if isinstance(item, tuple):
+            return int("".join([str(i) for i in item]), 2)
+        return item
+
+    def append(self, item: Any) -> None:
+        """
+        Pushes an item, bit tuples of length 8 and single characters are stored compactly.
+        """
+        value, tag = _pack(item)
+        if tag == _OTHER:
+            self._others[len(self._values)] = item
+        self._values.append(value)
+        self._tags.append(tag)
+
+    def extend(self, items: Iterable) -> None:
+        """
+        Pushes all items, the last one ends up on top.
+        """
+        for item in items:
+            self.append(item)
+
+    def insert(self, index: int, item: Any) -> None:
+        """
+        Inserts an item before index, like list.insert().
+        """
+        index = min(max(index + len(self._tags) if index < 0 else index, 0), len(self))
+        value, tag = _pack(item)
+        if self._others:
+            self._others = {
+                (i + 1 if i >= index else i): other for i, other in self._others.items()
+            }
+        if tag == _OTHER:
+            self._others[index] = item
+        self._values.insert(index, value)
+        self._tags.insert(index, tag)
+
+    def pop(self, index: int = -1) -> Any:
+        """
+        Removes and returns an item in its observable form, the top one by default.
+
+        Raises:
+            IndexError: If the stack is empty or index is out of range
+        """
+        item = self[index]
+        if index == -1:
+            self._tags.pop()
+            self._values.pop()
+            self._others.pop(len(self._values), None)
+        else:
+            del self[index]
+        return item
+
+    def clear(self) -> None:
+        """
+        Removes all items.
+        """
+        self._values.clear()
+        self._tags.clear()
+        self._others.clear()
+
+    def copy(self) -> "OperandStack":
+        """
+        Returns a shallow copy of the stack.
+        """
+        stack = OperandStack()
+        stack._values = bytearray(self._values)
+        stack._tags = bytearray(self._tags)
+        stack._others = dict(self._others)
+        return stack
+
+    def _item(self, index: int) -> Any:
+        tag = self._tags[index]
+        if tag == _BYTE:
+            return _BYTE_TUPLES[self._values[index]]
+        if tag == _CHAR:
+            return chr(self._values[index])
+        return self._others[index]
+
+    def _index(self, index: int) -> int:
+        """
+        Returns the non-negative position of an index.
+
+        Raises:
+            IndexError: If the index is out of range
+        """
+        index = index.__index__()
+        if index < 0:
+            index += len(self._tags)
+        if not 0 <= index < len(self._tags):
+            raise IndexError("stack index out of range")
+        return index
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self._item(i) for i in range(*index.indices(len(self._tags)))]
+        return self._item(self._index(index))
+
+    def __setitem__(self, index: Union[int, slice], item: Any) -> None:
+        if isinstance(index, slice):
+            items = list(self)
+            items[index] = item
+            self.clear()
+            self.extend(items)
+            return
+        index = self._index(index)
+        value, tag = _pack(item)
+        self._others.pop(index, None)
+        if tag == _OTHER:
+            self._others[index] = item
+        self._values[index] = value
+        self._tags[index] = tag
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        if isinstance(index, slice):
+            items = list(self)
+            del items[index]
+            self.clear()
+            self.extend(items)
+            return
+        index = self._index(index)
+        del self._values[index]
+        del self._tags[index]
+        if self._others:
+            self._others = {
+                (i - 1 if i > index else i): other
+                for i, other in self._others.items()
+                if i != index
+            }
+
+    def __len__(self) -> int:
+        return len(self._tags)
+
+    def __iter__(self) -> Iterator:
+        return (self._item(i) for i in range(len(self._tags)))
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (OperandStack, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __add__(self, other: Any) -> list:
+        if isinstance(other, (OperandStack, list)):
+            return list(self) + list(other)
+        return NotImplemented
+
+    def __radd__(self, other: Any) -> list:
+        if isinstance(other, list):
+            return other + list(self)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+def _pack(item: Any) -> Tuple[int, int]:
+    """
+    Returns the stored value and the tag of a stack item. Items tagged _OTHER are stored
+    with the value 0 and kept in the side store.
+    """
+    if type(item) is tuple:
+        try:
+            value = _TUPLE_BYTES.get(item)
+        except TypeError:
+            # Unhashable contents
+            value = None
+        if value is not None:
+            return value, _BYTE
+    elif type(item) is str and len(item) == 1 and ord(item) < 256:
+        return ord(item), _CHAR
+    return 0, _OTHER
+
+
+def _parse_code_word(byte: int) -> Union[int, Instruction, str]:
+    """
+    Parses the integer value of a code word into an operand, a character or an instruction.
+    """
+    if 0 <= byte <= 15:
+        # Is a number
+        return byte
+    elif 16 <= byte <= 31:
+        # Is an instruction
+        return Instruction(byte)
+    elif 32 <= byte <= 35:
+        # Is a special case
+        if byte == 33:
+            return Instruction.SPEAK
+        elif byte == 34:
+            return " "
+        else:
+            return Instruction.NOP
+    elif 36 <= byte <= 61:
+        # Is a letter
+        return chr(ord("A") + byte - 36)
+    else:
+        return Instruction.NOP
+
+
+# Parsed code words, built once per process: by integer value (up to a byte) and by 6-tuple
+_PARSED_INTS: Tuple[Union[int, Instruction, str], ...] = tuple(
+    _parse_code_word(byte) for byte in range(256)
+)
+_CODE_WORD_VALUES: Dict[Tuple[int, ...], int] = {
+    tuple((byte >> i) & 1 for i in range(5, -1, -1)): byte for byte in range(64)
+}
+_PARSED_TUPLES: Dict[Tuple[int, ...], Union[int, Instruction, str]] = {
+    bits: _PARSED_INTS[byte] for bits, byte in _CODE_WORD_VALUES.items()
+}
+
+
 class StackMachine:
     """
     Implements the 8-bit stack machine according to the specification
@@ -53,30 +330,48 @@ class StackMachine:
         Initializes the class StackMachine with all values necessary.
         """
         self.overflow = False
-        self.stack: List[int or str] = []
-
-    def _parse_byte(self, code_word: Tuple[int, ...]) -> int or Instruction or str:
-        # TODO: tuple of bin to int
-        byte = int("".join([str(i) for i in code_word]), 2)
-        if 0 <= byte <= 15:
-            # Is a number
-            return byte
-        elif 16 <= byte <= 31:
-            # Is an instruction
-            return Instruction(byte)
-        elif 32 <= byte <= 35:
-            # Is a special case
-            if byte == 33:
-                return Instruction.SPEAK
-            elif byte == 34:
-                return " "
-            else:
-                return Instruction.NOP
-        elif 36 <= byte <= 61:
-            # Is a letter
-            return chr(ord("A") + byte - 36)
-        else:
-            return Instruction.NOP
+        self._stack = OperandStack()
+
+    @property
+    def stack(self) -> OperandStack:
+        """
+        Operand stack, bytes appear as 8-tuples of bits and characters as str
+        """
+        return self._stack
+
+    @stack.setter
+    def stack(self, items: Iterable) -> None:
+        # Copy first, items may be the stack itself, e.g. after sm.stack += [item]
+        items = list(items)
+        self._stack.clear()
+        self._stack.extend(items)
+
+    def _parse_byte(
+        self, code_word: Union[int, Tuple[int, ...]]
+    ) -> int or Instruction or str:
+        if isinstance(code_word, int):
+            if 0 <= code_word <= 255:
+                return _PARSED_INTS[code_word]
+            return _parse_code_word(code_word)
+        try:
+            parsed = _PARSED_TUPLES.get(code_word)
+        except TypeError:
+            # Unhashable code word, e.g. a list
+            parsed = None
+        if parsed is None:
+            parsed = _parse_code_word(int("".join([str(i) for i in code_word]), 2))
+        return parsed
+
+    def _step(
+        self, code_word: Union[int, Tuple[int, ...]]
+    ) -> Tuple[Union[None, Callable], int, Union[None, int, str]]:
+        """
+        Returns the step of a code word: (handler, overflow handling, None) for instructions
+        and (None, _KEEP_OVERFLOW, operand) for operands and characters.
+        """
+        if type(code_word) is int and 0 <= code_word <= 255:
+            return _STEPS[code_word]
+        return _make_step(self._parse_byte(code_word))
 
     def do(self, code_word: Tuple[int, ...]) -> SMState:
         """
@@ -108,6 +403,82 @@ class StackMachine:
             self.overflow = False
             return SMState.RUNNING
 
+    def run(
+        self,
+        program: Union["CompiledProgram", Iterable[Union[int, Tuple[int, ...]]]],
+        max_steps: Union[None, int] = None,
+    ) -> Tuple[SMState, int, int]:
+        """
+        Executes code words like do() until STP, an error or the end of the program.
+
+        Args:
+            program (iterable): Code words as 6-tuples or ints, e.g. a bytes object, or a
+                CompiledProgram from compile()
+            max_steps (int): Maximum number of code words to execute, None for no limit
+        Returns:
+            tuple: (SMState, number of executed code words, position) where position is the
+                index of the STP or failing code word, otherwise the index of the next one
+        """
+        compiled = isinstance(program, CompiledProgram)
+        to_step = self._step
+        execute = self._execute
+        push_byte = self._stack.push_byte
+        push = self._stack.append
+        stopped = SMState.STOPPED
+        words = iter(program.steps if compiled else program)
+        if max_steps is not None:
+            words = islice(words, max_steps)
+
+        position = -1
+        try:
+            for position, item in enumerate(words):
+                handler, overflow, operand = item if compiled else to_step(item)
+                if handler is not None:
+                    if execute(handler, overflow) is stopped:
+                        return stopped, position + 1, position
+                else:
+                    if type(operand) is int:
+                        push_byte(operand)
+                    else:
+                        push(operand)
+                    self.overflow = False
+        except IndexError as ie:
+            print(f"IndexError: {ie}")
+            return SMState.ERROR, position + 1, position
+        except (NotImplementedError, ZeroDivisionError, ValueError):
+            return SMState.ERROR, position + 1, position
+        except Exception as e:
+            print(f"Unknown error: {e}")
+            return SMState.ERROR, position + 1, position
+        return SMState.RUNNING, position + 1, position + 1
+
+    @staticmethod
+    def compile(program: Iterable[Union[int, Tuple[int, ...]]]) -> "CompiledProgram":
+        """
+        Parses and validates code words once, so the program can be run repeatedly with
+        run() without parsing it again.
+
+        Args:
+            program (iterable): Code words as 6-tuples of bits or ints from 0 to 63
+        Raises:
+            ValueError: If a code word is neither
+        Returns:
+            CompiledProgram: Program for run() on any machine
+        """
+        code = bytearray()
+        for position, code_word in enumerate(program):
+            if isinstance(code_word, int):
+                value = code_word if 0 <= code_word <= 63 else None
+            else:
+                try:
+                    value = _CODE_WORD_VALUES.get(tuple(code_word))
+                except TypeError:
+                    value = None
+            if value is None:
+                raise ValueError(f"Invalid code word {code_word!r} at {position}")
+            code.append(value)
+        return CompiledProgram(code)
+
     def top(self) -> Union[None, str, Tuple[int, int, int, int, int, int, int, int]]:
         """
         Returns the top element of the stack.
@@ -115,7 +486,7 @@ class StackMachine:
         Returns:
             union: Can be tuple, str or None
         """
-        return self.stack[-1] if len(self.stack) > 0 else None
+        return self._stack[-1] if len(self._stack) > 0 else None
 
     def _push(
         self, value: int or Tuple[int, int, int, int, int, int, int, int] or str
@@ -123,15 +494,18 @@ class StackMachine:
         """
         Pushes a value on the stack.
         """
-        # Convert to Tuple if int
+        # Store bytes directly, larger ints are converted to tuples
         if isinstance(value, int):
-            self.stack.append(tuple(int(bit) for bit in bin(value)[2:].zfill(8)))
+            if 0 <= value <= 255:
+                self._stack.push_byte(value)
+            else:
+                self._stack.append(tuple(int(bit) for bit in bin(value)[2:].zfill(8)))
         elif isinstance(value, tuple):
-            self.stack.append(value)
+            self._stack.append(value)
         elif isinstance(value, str):
             if len(value) != 1:
                 raise ValueError("String must be of length 1")
-            self.stack.append(value)
+            self._stack.append(value)
 
     def _pop_operands_from_stack(self, n=2) -> Tuple[int or str, ...]:
         """
@@ -143,118 +517,191 @@ class StackMachine:
         Returns:
             tuple: Tuple of n operands
         """
-        if len(self.stack) < n:
+        if len(self._stack) < n:
             raise IndexError("operand mismatch")
         else:
-            return tuple(
-                int("".join([str(i) for i in self.stack.pop()]), 2)
-                if isinstance(self.stack[-1], tuple)
-                else self.stack.pop()
-                for _ in range(n)
-            )
+            pop = self._stack.pop_operand
+            return tuple(pop() for _ in range(n))
 
     def _run_instruction(self, instr: Instruction) -> SMState:
-        MAX_INT = 255
-        if instr == Instruction.STP:
-            return SMState.STOPPED
-        elif instr == Instruction.DUP:
-            ops = self._pop_operands_from_stack(1)
-            self._push(ops[0])
-            self._push(ops[0])
-        elif instr == Instruction.DEL:
-            self._pop_operands_from_stack(1)
-        elif instr == Instruction.SWP:
-            ops = self._pop_operands_from_stack(2)
-            self._push(ops[0])
-            self._push(ops[1])
-        elif instr == Instruction.ADD:
-            ops = self._pop_operands_from_stack()
-            result = ops[1] + ops[0]
-            if result > MAX_INT:
-                result %= MAX_INT + 1
-                self.overflow = True
-            else:
-                self.overflow = False
-            self._push(result)
-        elif instr == Instruction.SUB:
-            ops = self._pop_operands_from_stack()
-            result = ops[1] - ops[0]
-            if result < 0:
-                result = (MAX_INT + 1) + result
-                self.overflow = True
-            else:
-                self.overflow = False
-            self._push(result)
-        elif instr == Instruction.MUL:
-            ops = self._pop_operands_from_stack()
-            result = ops[1] * ops[0]
-            if result > MAX_INT:
-                result %= MAX_INT + 1
-                self.overflow = True
-            else:
-                self.overflow = False
-            self._push(result)
-        elif instr == Instruction.DIV:
-            ops = self._pop_operands_from_stack()
-            self.overflow = False
-            self._push(ops[1] // ops[0])
-        elif instr == Instruction.EXP:
-            ops = self._pop_operands_from_stack()
-            result = ops[1] ** ops[0]
-            if result > MAX_INT:
-                result %= MAX_INT + 1
-                self.overflow = True
-            else:
-                self.overflow = False
-            self._push(result)
-        elif instr == Instruction.MOD:
-            self.overflow = False
-            ops = self._pop_operands_from_stack()
-            result = ops[1] % ops[0]
-            self._push(result)
-        elif instr == Instruction.SHL:
-            self.overflow = False
-            ops = self._pop_operands_from_stack()
-            result = ops[1] << ops[0]
-            if result > MAX_INT:
+        """
+        Executes an instruction through the dispatch table and does the overflow bookkeeping
+        shared by all arithmetic instructions.
+        """
+        return self._execute(*self._DISPATCH[instr.value])
+
+    def _execute(self, handler: Callable, overflow: int) -> SMState:
+        """
+        Executes an instruction handler with the given overflow handling.
+        """
+        if overflow == _KEEP_OVERFLOW:
+            state = handler(self)
+            return SMState.RUNNING if state is None else state
+        if overflow == _SET_OVERFLOW:
+            # The flag is left alone if the handler fails
+            result = handler(self)
+            wrapped = not 0 <= result <= MAX_INT
+            if wrapped:
                 result %= MAX_INT + 1
-                self.overflow = True
-            self._push(result)
-        elif instr == Instruction.SHR:
-            self.overflow = False
-            ops = self._pop_operands_from_stack()
-            result = ops[1] >> ops[0]
-            self._push(result)
-        elif instr == Instruction.HEX:
-            self.overflow = False
-            ops = self._pop_operands_from_stack()
-            # Check if any operator is longer than 1 character as a string
-            if any([len(str(o)) > 1 for o in ops]):
-                raise ValueError("operand mismatch")
-            result = int("".join([str(o) for o in ops]), 16)
-            self._push(result)
-        elif instr == Instruction.FAC:
+            self.overflow = wrapped
+        else:
             self.overflow = False
-            ops = self._pop_operands_from_stack(1)
-            result = factorial(ops[0])
-            if result > MAX_INT:
+            result = handler(self)
+            if overflow == _WRAP_OVERFLOW and not 0 <= result <= MAX_INT:
                 result %= MAX_INT + 1
                 self.overflow = True
-            self._push(result)
-        elif instr == Instruction.NOT:
-            self.overflow = False
-            ops = self._pop_operands_from_stack(1)
-            self._push(~ops[0] & 0b11111111)
-        elif instr == Instruction.XOR:
-            self.overflow = False
-            ops = self._pop_operands_from_stack()
-            result = ops[1] ^ ops[0]
-            self._push(result)
-        elif instr == Instruction.NOP:
-            # Do nothing
-            pass
-        elif instr == Instruction.SPEAK:
-            string_length = self._pop_operands_from_stack(1)[0]
-            string = "".join(str(o) for o in self._pop_operands_from_stack(string_length))
-            print(string)
+        self._push(result)
         return SMState.RUNNING
+
+    # Handlers of the instructions. Arithmetic handlers return the result to push,
+    # the others return the new state or None to keep running.
+
+    def _instr_stp(self) -> SMState:
+        return SMState.STOPPED
+
+    def _instr_dup(self) -> None:
+        ops = self._pop_operands_from_stack(1)
+        self._push(ops[0])
+        self._push(ops[0])
+
+    def _instr_del(self) -> None:
+        self._pop_operands_from_stack(1)
+
+    def _instr_swp(self) -> None:
+        ops = self._pop_operands_from_stack(2)
+        self._push(ops[0])
+        self._push(ops[1])
+
+    def _instr_add(self) -> int:
+        ops = self._pop_operands_from_stack()
+        return ops[1] + ops[0]
+
+    def _instr_sub(self) -> int:
+        ops = self._pop_operands_from_stack()
+        return ops[1] - ops[0]
+
+    def _instr_mul(self) -> int:
+        ops = self._pop_operands_from_stack()
+        return ops[1] * ops[0]
+
+    def _instr_div(self) -> None:
+        # The flag is cleared after popping, even if the division fails
+        ops = self._pop_operands_from_stack()
+        self.overflow = False
+        self._push(ops[1] // ops[0])
+
+    def _instr_exp(self) -> int:
+        ops = self._pop_operands_from_stack()
+        return ops[1] ** ops[0]
+
+    def _instr_mod(self) -> int:
+        ops = self._pop_operands_from_stack()
+        return ops[1] % ops[0]
+
+    def _instr_shl(self) -> int:
+        ops = self._pop_operands_from_stack()
+        return ops[1] << ops[0]
+
+    def _instr_shr(self) -> int:
+        ops = self._pop_operands_from_stack()
+        return ops[1] >> ops[0]
+
+    def _instr_hex(self) -> int:
+        ops = self._pop_operands_from_stack()
+        # Check if any operator is longer than 1 character as a string
+        if any([len(str(o)) > 1 for o in ops]):
+            raise ValueError("operand mismatch")
+        return int("".join([str(o) for o in ops]), 16)
+
+    def _instr_fac(self) -> int:
+        ops = self._pop_operands_from_stack(1)
+        return factorial(ops[0])
+
+    def _instr_not(self) -> int:
+        ops = self._pop_operands_from_stack(1)
+        return ~ops[0] & 0b11111111
+
+    def _instr_xor(self) -> int:
+        ops = self._pop_operands_from_stack()
+        return ops[1] ^ ops[0]
+
+    def _instr_nop(self) -> None:
+        # Do nothing
+        pass
+
+    def _instr_speak(self) -> None:
+        string_length = self._pop_operands_from_stack(1)[0]
+        string = "".join(str(o) for o in self._pop_operands_from_stack(string_length))
+        print(string)
+
+    # Handler and overflow handling of every instruction by opcode value (None for NOP)
+    _DISPATCH: Dict[Union[None, int], Tuple[Callable, int]] = {
+        Instruction.STP.value: (_instr_stp, _KEEP_OVERFLOW),
+        Instruction.DUP.value: (_instr_dup, _KEEP_OVERFLOW),
+        Instruction.DEL.value: (_instr_del, _KEEP_OVERFLOW),
+        Instruction.SWP.value: (_instr_swp, _KEEP_OVERFLOW),
+        Instruction.ADD.value: (_instr_add, _SET_OVERFLOW),
+        Instruction.SUB.value: (_instr_sub, _SET_OVERFLOW),
+        Instruction.MUL.value: (_instr_mul, _SET_OVERFLOW),
+        Instruction.DIV.value: (_instr_div, _KEEP_OVERFLOW),
+        Instruction.EXP.value: (_instr_exp, _SET_OVERFLOW),
+        Instruction.MOD.value: (_instr_mod, _CLEAR_OVERFLOW),
+        Instruction.SHL.value: (_instr_shl, _WRAP_OVERFLOW),
+        Instruction.SHR.value: (_instr_shr, _CLEAR_OVERFLOW),
+        Instruction.HEX.value: (_instr_hex, _CLEAR_OVERFLOW),
+        Instruction.FAC.value: (_instr_fac, _WRAP_OVERFLOW),
+        Instruction.NOT.value: (_instr_not, _CLEAR_OVERFLOW),
+        Instruction.XOR.value: (_instr_xor, _CLEAR_OVERFLOW),
+        Instruction.NOP.value: (_instr_nop, _KEEP_OVERFLOW),
+        Instruction.SPEAK.value: (_instr_speak, _KEEP_OVERFLOW),
+    }
+
+
+def _make_step(
+    word: Union[int, Instruction, str],
+) -> Tuple[Union[None, Callable], int, Union[None, int, str]]:
+    """
+    Returns the step executed by StackMachine.run() for a parsed code word.
+    """
+    if isinstance(word, Instruction):
+        handler, overflow = StackMachine._DISPATCH[word.value]
+        return handler, overflow, None
+    return None, _KEEP_OVERFLOW, word
+
+
+# Steps of all code words up to a byte, built once per process
+_STEPS = tuple(_make_step(word) for word in _PARSED_INTS)
+
+
+class CompiledProgram:
+    """
+    Program parsed once by StackMachine.compile(). The code words are kept as one byte each
+    and resolved to the handlers and immediates of their steps, only the bytes are pickled.
+    """
+
+    def __init__(self, code: Union[bytes, bytearray]) -> None:
+        """
+        Initializes the program, use StackMachine.compile() to validate the code words.
+
+        Args:
+            code (bytes): Code words as values from 0 to 63
+        """
+        self.code = bytes(code)
+        self.steps = tuple(_STEPS[value] for value in self.code)
+
+    def __len__(self) -> int:
+        return len(self.code)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, CompiledProgram):
+            return self.code == other.code
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.code)
+
+    def __reduce__(self) -> Tuple[type, Tuple[bytes]]:
+        return CompiledProgram, (self.code,)
+
+    def __repr__(self) -> str:
+        return f"CompiledProgram({self.code!r})"
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+
+import json
+import unittest
+
+from bench_hamming_code import ERROR_MIXES, run
+
+
+class TestBenchHammingCode(unittest.TestCase):
+    def test_run(self):
+        """Test that every path is measured for every error mix"""
+        results = run(words=64, batch_size=16, samples=8, workers=1)
+        self.assertEqual(results["words"], 64)
+        self.assertEqual(results["code"], [10, 6])
+        # The results can be written as JSON
+        json.dumps(results)
+
+        decode_paths = {
+            r["path"] for r in results["results"] if r["operation"] == "decode"
+        }
+        for path in (
+            "tuple-bitmask",
+            "int-specialized",
+            "tuple-table",
+            "int-table",
+            "sliced",
+            "buffer",
+        ):
+            self.assertIn(path, decode_paths)
+        for errors in ERROR_MIXES:
+            self.assertIn(
+                "parallel-1",
+                {r["path"] for r in results["results"] if r["errors"] == errors},
+            )
+        for result in results["results"]:
+            self.assertGreater(result["words_per_second"], 0)
+            self.assertEqual(set(result["latency_ns"]), {"p50", "p90", "p99"})
+
+
+if __name__ == "__main__":
+    unittest.main()
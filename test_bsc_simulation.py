@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+import unittest
+import unittest.mock
+
+from bsc_simulation import COUNTERS, channel_errors, simulate, sweep
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestBscSimulation(unittest.TestCase):
+    def test_simulate(self):
+        """Test the counters and rates of a clean and a noisy channel"""
+        clean = simulate(0.0, 1000, seed=1, batch_size=300)
+        self.assertEqual(clean["words"], 1000)
+        self.assertEqual(clean["valid"], 1000)
+        self.assertEqual(clean["bit_error_rate"], 0)
+        self.assertEqual(clean["frame_error_rate"], 0)
+
+        noisy = simulate(0.05, 20000, seed=1)
+        self.assertEqual(
+            noisy["valid"] + noisy["corrected"] + noisy["uncorrectable"], 20000
+        )
+        self.assertGreater(noisy["corrected_rate"], noisy["uncorrectable_rate"])
+        self.assertGreater(noisy["frame_error_rate"], 0)
+        self.assertLessEqual(noisy["bit_error_rate"], noisy["frame_error_rate"])
+        self.assertGreaterEqual(noisy["bit_errors"], 6 * noisy["uncorrectable"])
+        self.assertLessEqual(noisy["bit_errors"], 6 * noisy["frame_errors"])
+
+        # The all ones word is a codeword of the extended (7, 4) code, so inverting every
+        # bit yields another valid codeword with wrong data
+        inverted = simulate(1.0, 100, seed=1, total_bits=7, data_bits=4)
+        self.assertEqual(inverted["frame_errors"], 100)
+
+    def test_uncorrectable_zero_data(self):
+        """Test that uncorrectable words count as errors even if their data was zero"""
+        default_rng = np.random.default_rng
+
+        class ZeroData:
+            def __init__(self, seed):
+                self.rng = default_rng(seed)
+
+            def integers(self, low, high, size, dtype):
+                return np.zeros(size, dtype=dtype)
+
+            def random(self, *args, **kwargs):
+                return self.rng.random(*args, **kwargs)
+
+        with unittest.mock.patch.object(np.random, "default_rng", ZeroData):
+            result = simulate(0.5, 20000, seed=1, total_bits=7, data_bits=4)
+        self.assertGreater(result["uncorrectable"], 0)
+        self.assertGreaterEqual(result["frame_errors"], result["uncorrectable"])
+        self.assertGreaterEqual(result["bit_errors"], 4 * result["uncorrectable"])
+
+    def test_channel_errors(self):
+        """Test that small and large flip probabilities are drawn without bias"""
+        # The number of flips follows the binomial distribution exactly, even far below
+        # the resolution of single precision floats
+        for p in (1e-9, 3e-8, 1e-7, 1e-3):
+            flips = channel_errors(np.random.default_rng(2), 1 << 20, 11, p)
+            expected = np.random.default_rng(2).binomial(11 << 20, p)
+            self.assertEqual(flips.shape, (1 << 20, 11))
+            self.assertEqual(int(flips.sum()), expected)
+
+        for p in (0.01, 0.2):
+            rate = channel_errors(np.random.default_rng(3), 100000, 11, p).mean()
+            self.assertAlmostEqual(rate, p, delta=5 * (p / 1.1e6) ** 0.5)
+        self.assertTrue(channel_errors(np.random.default_rng(4), 10, 11, 1.0).all())
+        self.assertFalse(channel_errors(np.random.default_rng(4), 10, 11, 0.0).any())
+
+    def test_sweep(self):
+        """Test that the sweep is reproducible and splits the words among the workers"""
+        results = sweep([0.0, 0.01], 1001, workers=2, seed=7)
+        self.assertEqual([r["p"] for r in results], [0.0, 0.01])
+        self.assertEqual(results[0]["frame_errors"], 0)
+        self.assertEqual(results, sweep([0.0, 0.01], 1001, workers=2, seed=7))
+        for result in results:
+            self.assertEqual(result["words"], 1001)
+            for name in COUNTERS:
+                self.assertIsInstance(result[name], int)
+
+
+if __name__ == "__main__":
+    unittest.main()
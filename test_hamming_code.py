@@ -1,7 +1,30 @@
 #!/usr/bin/env python3
 
+import io
+import mmap
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
 import unittest
-from hamming_code import HammingCode, HCResult
+from array import array
+from itertools import product
+from unittest import mock
+import hamming_code
+from hamming_code import (
+    HammingCode,
+    HCResult,
+    RESULT_CODES,
+    RESULTS_BY_CODE,
+    parallel_decode,
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 valid_words = [
     ((0, 0, 0, 0, 0, 0), (0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)),
@@ -203,6 +226,577 @@ class TestHammingCode(unittest.TestCase):
         for source_word, expected_encoded_word in test_cases:
             self.assertEqual(self.instance.encode(source_word), expected_encoded_word)
 
+    def test_parametric_codes(self):
+        """Test class instantiation with other code parameters"""
+        rng = random.Random(8)
+        for n, k in [(7, 4), (11, 7), (15, 11), (31, 26), (63, 57), (127, 120)]:
+            instance = HammingCode(n, k)
+            self.assertEqual(instance.parity_bits, n - k)
+            # Systematic generator matrix G = [I | P] with G * H^T = 0
+            for i, row in enumerate(instance.g):
+                self.assertEqual(row[:k], [int(i == j) for j in range(k)])
+                for h_row in instance.h:
+                    self.assertEqual(sum(a * b for a, b in zip(row, h_row)) % 2, 0)
+
+            for _ in range(20):
+                data = rng.getrandbits(k)
+                word = instance.encode_int(data)
+                self.assertEqual(instance.decode_int(word), (data, HCResult.VALID))
+                first, second = rng.sample(range(n + 1), 2)
+                self.assertEqual(
+                    instance.decode_int(word ^ (1 << first)),
+                    (data, HCResult.CORRECTED),
+                )
+                self.assertEqual(
+                    instance.decode_int(word ^ (1 << first) ^ (1 << second)),
+                    (None, HCResult.UNCORRECTABLE),
+                )
+
+            data = bytes(rng.getrandbits(8) for _ in range(100))
+            encoded = b"".join(instance.encode_stream(data))
+            self.assertEqual(b"".join(instance.decode_stream(encoded)), data)
+
+        for n, k in [(8, 6), (16, 12), (10, 0), (2, 1)]:
+            with self.assertRaises(ValueError):
+                HammingCode(n, k)
+
+    def test_shared_code(self):
+        """Test that instances with the same parameters share their matrices and tables"""
+        instances = []
+        threads = [
+            threading.Thread(target=lambda: instances.append(HammingCode(15, 11)))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        first = instances[0]
+        for instance in instances[1:]:
+            self.assertIs(instance.g_masks, first.g_masks)
+            self.assertIs(instance.h_masks, first.h_masks)
+        self.assertIs(HammingCode().h_masks, self.instance.h_masks)
+
+        # The lazily built codebook is shared as well, even if threads race for it
+        hamming_code._registry.pop((7, 4), None)
+        codes = [HammingCode(7, 4) for _ in range(4)]
+        llrs = [1.0] * 8
+        threads = [
+            threading.Thread(target=code.decode_soft, args=(llrs,)) for code in codes
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        codebook = hamming_code._registry[(7, 4)].codebook
+        self.assertEqual(len(codebook), 16)
+        self.assertIs(codes[0]._HammingCode__get_codebook(), codebook)
+
+        # G and H are copies, changing them does not affect other instances
+        g = self.instance.g
+        g[0][0] = 0
+        self.assertEqual(HammingCode().g[0][0], 1)
+        self.assertEqual(self.instance.g[0][0], 1)
+
+    def test_lazy_imports(self):
+        """Test that importing the module does not import the optional heavy modules"""
+        modules = subprocess.run(
+            [sys.executable, "-c", "import sys, hamming_code; print(*sys.modules)"],
+            cwd=os.path.dirname(os.path.abspath(hamming_code.__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        for name in ("numpy", "multiprocessing", "tempfile"):
+            self.assertNotIn(name, modules)
+
+    def test_cache(self):
+        """Test that derived codes are written to and loaded from the cache directory"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "hamming_7_4.bin")
+            hamming_code._registry.pop((7, 4), None)
+            expected = HammingCode(7, 4, cache_dir=directory)
+            with open(path, "rb") as file:
+                cache = file.read()
+            self.assertEqual(cache[:4], b"HAMC")
+
+            # Loading the cache does not derive the code again
+            hamming_code._registry.pop((7, 4), None)
+            with mock.patch.object(
+                HammingCode, "_HammingCode__derive_code", side_effect=AssertionError
+            ):
+                code = HammingCode(7, 4, cache_dir=directory)
+            self.assertEqual(code.g, expected.g)
+            self.assertEqual(code.h, expected.h)
+            for word in range(256):
+                self.assertEqual(code.decode_int(word), expected.decode_int(word))
+            for word, _ in valid_words[:16]:
+                self.assertEqual(code.encode(word[2:]), expected.encode(word[2:]))
+
+            # Damaged caches and caches of other versions are rebuilt
+            for offset in (4, len(cache) - 1):
+                damaged = bytearray(cache)
+                damaged[offset] ^= 1
+                with open(path, "wb") as file:
+                    file.write(damaged)
+                hamming_code._registry.pop((7, 4), None)
+                code = HammingCode(7, 4, cache_dir=directory)
+                self.assertEqual(code.h, expected.h)
+                with open(path, "rb") as file:
+                    self.assertEqual(file.read(), cache)
+
+            # Caches derived from another G' are stale, even with a valid CRC
+            hamming_code._registry.pop((7, 4), None)
+            gns = HammingCode(7, 4)._HammingCode__non_systematic_g()
+            with mock.patch.object(
+                HammingCode, "_HammingCode__non_systematic_g", return_value=gns[::-1]
+            ):
+                hamming_code._registry.pop((7, 4), None)
+                HammingCode(7, 4, cache_dir=directory)
+                with open(path, "rb") as file:
+                    stale = file.read()
+                self.assertNotEqual(stale[:24], cache[:24])
+                self.assertEqual(stale[24:], cache[24:])
+            hamming_code._registry.pop((7, 4), None)
+            code = HammingCode(7, 4, cache_dir=directory)
+            with open(path, "rb") as file:
+                self.assertEqual(file.read(), cache)
+
+            # Other users can read the cache according to the umask
+            for mask, mode in ((0o022, 0o644), (0o077, 0o600)):
+                umask = os.umask(mask)
+                try:
+                    os.unlink(path)
+                    hamming_code._registry.pop((7, 4), None)
+                    HammingCode(7, 4, cache_dir=directory)
+                finally:
+                    self.assertEqual(os.umask(umask), mask)
+                self.assertEqual(os.stat(path).st_mode & 0o777, mode)
+            self.assertEqual(os.listdir(directory), ["hamming_7_4.bin"])
+
+            # Tables are added to a cache without them
+            hamming_code._registry.pop((7, 4), None)
+            os.unlink(path)
+            HammingCode(7, 4, lookup_tables=False, cache_dir=directory)
+            self.assertLess(os.path.getsize(path), len(cache))
+            hamming_code._registry.pop((7, 4), None)
+            HammingCode(7, 4, cache_dir=directory)
+            self.assertEqual(os.path.getsize(path), len(cache))
+
+            # Codes that are already registered are written to a missing or stale cache
+            os.unlink(path)
+            HammingCode(7, 4, cache_dir=directory)
+            with open(path, "rb") as file:
+                self.assertEqual(file.read(), cache)
+            with open(path, "wb") as file:
+                file.write(cache[:-1])
+            HammingCode(7, 4, cache_dir=directory)
+            with open(path, "rb") as file:
+                self.assertEqual(file.read(), cache)
+
+            # A valid cache is not written again
+            with mock.patch.object(
+                HammingCode, "_HammingCode__save_cache", side_effect=AssertionError
+            ):
+                HammingCode(7, 4, cache_dir=directory)
+
+    def test_stats(self):
+        """Test the decoder statistics"""
+        self.assertIsNone(self.instance.stats)
+
+        for lookup_tables in (True, False):
+            instance = HammingCode(stats=True, lookup_tables=lookup_tables)
+            word = valid_words[5][1]
+            instance.decode(word)
+            for i in range(11):
+                # Single bit errors in every position
+                instance.decode(tuple(b ^ (i == j) for j, b in enumerate(word)))
+            instance.decode_int(0b11000000000)
+
+            snapshot = instance.stats.snapshot(reset=True)
+            self.assertEqual(
+                snapshot["results"], {"VALID": 1, "CORRECTED": 11, "UNCORRECTABLE": 1}
+            )
+            self.assertEqual(snapshot["corrected_positions"], [1] * 10)
+            self.assertEqual(snapshot["parity_corrections"], 1)
+            self.assertEqual(sum(snapshot["latency_buckets"]), 13)
+
+            snapshot = instance.stats.snapshot()
+            self.assertEqual(sum(snapshot["results"].values()), 0)
+            self.assertEqual(sum(snapshot["latency_buckets"]), 0)
+
+    def test_lookup_tables(self):
+        """Test that the lookup tables match the computed results"""
+        direct = HammingCode(lookup_tables=False)
+
+        for word, _ in valid_words:
+            self.assertEqual(self.instance.encode(word), direct.encode(word))
+
+        for code in product((0, 1), repeat=11):
+            self.assertEqual(self.instance.decode(code), direct.decode(code))
+
+        # Lists are looked up like tuples
+        self.assertEqual(
+            self.instance.decode([0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1]),
+            ((0, 0, 0, 0, 0, 0), HCResult.CORRECTED),
+        )
+
+    def test_specialized(self):
+        """Test that the generated functions match the generic ones"""
+        for total_bits, data_bits in ((10, 6), (7, 4), (15, 11), (3, 1)):
+            generic = HammingCode(total_bits, data_bits, lookup_tables=False)
+            code = HammingCode(
+                total_bits, data_bits, lookup_tables=False, specialized=True
+            )
+            self.assertIn("def decode_int(word):", code.specialized_source)
+            self.assertNotIn("for ", code.specialized_source)
+            for word in range(1 << (total_bits + 1)):
+                self.assertEqual(code.decode_int(word), generic.decode_int(word))
+            for data in range(1 << data_bits):
+                self.assertEqual(code.encode_int(data), generic.encode_int(data))
+            self.assertIsNone(generic.specialized_source)
+
+        # The functions are generated once per code
+        code = HammingCode(specialized=True)
+        self.assertIs(
+            code.specialized_source, HammingCode(specialized=True).specialized_source
+        )
+        self.assertEqual(
+            code.decode(valid_words[9][1]), (valid_words[9][0], HCResult.VALID)
+        )
+
+        long_code = HammingCode(63, 57, specialized=True)
+        word = long_code.encode_int(12345) ^ (1 << 40)
+        self.assertEqual(long_code.decode_int(word), (12345, HCResult.CORRECTED))
+
+    def test_int_api(self):
+        """Test methods encode_int() and decode_int() against the tuple interface"""
+        to_int = lambda bits: int("".join(str(b) for b in bits), 2)
+
+        for instance in (self.instance, HammingCode(lookup_tables=False)):
+            for word, encoded_word in valid_words:
+                self.assertEqual(
+                    instance.encode_int(to_int(word)), to_int(encoded_word)
+                )
+
+            for code in product((0, 1), repeat=11):
+                data, result = self.instance.decode(code)
+                self.assertEqual(
+                    instance.decode_int(to_int(code)),
+                    (None if data is None else to_int(data), result),
+                )
+
+    def test_decode_sliced(self):
+        """Test method decode_sliced() against decode_int()"""
+        words = list(range(2048)) + [0b10110111101, 0b00000000001, 0b11111111111]
+        data, status = self.instance.decode_sliced(words)
+        self.assertEqual(len(data), len(words))
+        self.assertEqual(len(status), len(words))
+        for word, value, result_code in zip(words, data, status):
+            expected_data, expected_result = self.instance.decode_int(word)
+            self.assertEqual(RESULTS_BY_CODE[result_code], expected_result)
+            self.assertEqual(value, 0 if expected_data is None else expected_data)
+
+        self.assertEqual(self.instance.decode_sliced([]), ([], array("b")))
+
+    @unittest.skipIf(np is None, "requires numpy")
+    def test_batch(self):
+        """Test methods encode_batch() and decode_batch() against the tuple interface"""
+        words = [word for word, _ in valid_words]
+        self.assertEqual(
+            self.instance.encode_batch(np.array(words)).tolist(),
+            [list(encoded_word) for _, encoded_word in valid_words],
+        )
+
+        codes = list(product((0, 1), repeat=11))
+        data, status = self.instance.decode_batch(np.array(codes))
+        for code, row, result_code in zip(codes, data.tolist(), status.tolist()):
+            expected_data, expected_result = self.instance.decode(code)
+            self.assertEqual(RESULTS_BY_CODE[result_code], expected_result)
+            self.assertEqual(RESULT_CODES[expected_result], result_code)
+            if expected_data is None:
+                self.assertEqual(row, [0] * 6)
+            else:
+                self.assertEqual(tuple(row), expected_data)
+
+    def test_incremental(self):
+        """Test that the incremental decoder matches decode() bit by bit"""
+        decoder = self.instance.incremental()
+        for code in product((0, 1), repeat=11):
+            results = [decoder.push(bit) for bit in code]
+            self.assertEqual(results[:-1], [None] * 10)
+            self.assertEqual(results[-1], self.instance.decode(code))
+
+        # reset() discards a partial word
+        for bit in (1, 0, 1):
+            decoder.push(bit)
+        decoder.reset()
+        results = [decoder.push(bit) for bit in valid_words[5][1]]
+        self.assertEqual(results[-1], (valid_words[5][0], HCResult.VALID))
+
+    def test_decode_soft(self):
+        """Test method decode_soft() against decode() and with unreliable bits"""
+        # With equally reliable bits the soft decoder agrees with the hard decoder
+        for code in product((0, 1), repeat=11):
+            data, result, margin = self.instance.decode_soft([1 - 2 * b for b in code])
+            expected_data, expected_result = self.instance.decode(code)
+            self.assertEqual(result, expected_result)
+            if expected_result is HCResult.UNCORRECTABLE:
+                self.assertIsNone(data)
+                self.assertEqual(margin, 0)
+            else:
+                self.assertEqual(data, expected_data)
+                self.assertGreater(margin, 0)
+
+        # A double error in two weak bits is recovered
+        for source_word, encoded_word in valid_words:
+            llrs = [2.0 - 4.0 * b for b in encoded_word]
+            llrs[1] = -0.5 * llrs[1]
+            llrs[8] = -0.25 * llrs[8]
+            self.assertEqual(
+                self.instance.decode(tuple(int(llr < 0) for llr in llrs))[1],
+                HCResult.UNCORRECTABLE,
+            )
+            data, result, margin = self.instance.decode_soft(llrs)
+            self.assertEqual((data, result), (source_word, HCResult.CORRECTED))
+            self.assertGreater(margin, 0)
+
+        with self.assertRaises(ValueError):
+            self.instance.decode_soft([1.0] * 10)
+        with self.assertRaises(ValueError):
+            HammingCode(31, 26).decode_soft([1.0] * 32)
+
+    @unittest.skipIf(np is None, "requires numpy")
+    def test_decode_soft_batch(self):
+        """Test method decode_soft_batch() against decode_soft()"""
+        rng = np.random.default_rng(3)
+        llrs = rng.normal(0, 2, (500, 11))
+        llrs[0] = [1, -1, 1, 1, -1, 1, 1, 1, 1, 1, 1]
+        data, status, margin = self.instance.decode_soft_batch(llrs)
+        for row, data_row, result_code, row_margin in zip(llrs, data, status, margin):
+            expected_data, expected_result, expected_margin = self.instance.decode_soft(
+                row
+            )
+            self.assertEqual(RESULTS_BY_CODE[result_code], expected_result)
+            self.assertAlmostEqual(row_margin, expected_margin)
+            self.assertEqual(tuple(data_row), expected_data or (0,) * 6)
+
+    def test_stream(self):
+        """Test methods encode_stream() and decode_stream()"""
+        rng = random.Random(4)
+        for length in range(0, 40):
+            data = bytes(rng.randrange(256) for _ in range(length))
+            encoded = b"".join(self.instance.encode_stream(data, chunk_size=12))
+            # 6 data bytes are 8 words of 6 bits, which pack into 11 bytes of codewords
+            self.assertEqual(
+                len(encoded), length // 6 * 11 + [2, 3, 5, 7, 9, 10][length % 6]
+            )
+            self.assertEqual(
+                b"".join(self.instance.decode_stream(encoded, chunk_size=11)), data
+            )
+
+        # File objects and iterables of byte strings are accepted as well
+        data = bytes(range(256)) * 3
+        encoded = b"".join(
+            self.instance.encode_stream(io.BytesIO(data), chunk_size=100)
+        )
+        chunks = [encoded[i : i + 7] for i in range(0, len(encoded), 7)]
+        self.assertEqual(b"".join(self.instance.decode_stream(iter(chunks))), data)
+
+        # One flipped bit per codeword is corrected
+        damaged = bytearray(encoded)
+        for bit in range(0, len(damaged) * 8 - 11, 11):
+            damaged[bit // 8] ^= 0x80 >> (bit % 8)
+        self.assertEqual(b"".join(self.instance.decode_stream(damaged)), data)
+
+        # Two flipped bits in the same codeword are not
+        damaged[0] ^= 0x40
+        with self.assertRaises(ValueError):
+            b"".join(self.instance.decode_stream(damaged))
+        decoded = b"".join(self.instance.decode_stream(damaged, strict=False))
+        self.assertEqual(decoded[0] >> 2, 0)
+        self.assertEqual(decoded[1:], data[1:])
+
+        # An uncorrectable last codeword hides the end marker
+        damaged = bytearray(b"".join(self.instance.encode_stream(b"hello")))
+        damaged[8] ^= 0x30
+        for decode in (
+            lambda: b"".join(self.instance.decode_stream(damaged, strict=False)),
+            lambda: self.instance.decode_buffer(damaged, bytearray(10)),
+        ):
+            with self.assertRaisesRegex(ValueError, "End of stream marker"):
+                decode()
+
+    def test_interleave(self):
+        """Test methods interleave() and deinterleave() in streaming mode"""
+        rng = random.Random(5)
+        for depth in (1, 3, 8, 16):
+            for length in (0, 1, 5, 6, 47, 200):
+                data = bytes(rng.randrange(256) for _ in range(length))
+                plain = b"".join(self.instance.encode_stream(data))
+                encoded = b"".join(
+                    self.instance.encode_stream(
+                        data, chunk_size=13, interleave_depth=depth
+                    )
+                )
+                self.assertEqual(encoded, self.instance.interleave(plain, depth))
+                self.assertEqual(self.instance.deinterleave(encoded, depth), plain)
+                decoded = self.instance.decode_stream(
+                    encoded, chunk_size=9, interleave_depth=depth
+                )
+                self.assertEqual(b"".join(decoded), data)
+
+        # The first bit of every codeword comes first
+        words = [0b10000000000, 0, 0b10000000001, 0, 0, 0, 0, 0]
+        packed = sum(w << (11 * (7 - i)) for i, w in enumerate(words))
+        self.assertEqual(
+            self.instance.interleave(packed.to_bytes(11, "big"), 8)[0], 0b10100000
+        )
+        # Padding bits after the last codeword may span two bytes (32 = 2 * 11 + 10 bits)
+        packed = bytes([0b10000000, 0b00100000, 0b00000011, 0b11111111])
+        interleaved = self.instance.interleave(packed, 2)
+        self.assertEqual(interleaved, bytes([0b10000000, 0, 0b00001011, 255]))
+        self.assertEqual(self.instance.deinterleave(interleaved, 2), packed)
+        with self.assertRaises(ValueError):
+            self.instance.interleave(bytes(11), 3, final=False)
+        with self.assertRaises(ValueError):
+            self.instance.interleave(bytes(11), 0)
+
+        # A burst of 16 bits is spread over 16 codewords and corrected
+        data = bytes(range(256))
+        for depth in (1, 16):
+            encoded = b"".join(
+                self.instance.encode_stream(data, interleave_depth=depth)
+            )
+            damaged = bytearray(encoded)
+            damaged[100:102] = bytes(b ^ 0xFF for b in damaged[100:102])
+            decoded = self.instance.decode_stream(damaged, interleave_depth=depth)
+            if depth == 1:
+                with self.assertRaises(ValueError):
+                    b"".join(decoded)
+            else:
+                self.assertEqual(b"".join(decoded), data)
+
+    def test_decode_into(self):
+        """Test method decode_into() against decode_int()"""
+        words = [encoded_word for _, encoded_word in valid_words][:21]
+        words[3] = words[3][:2] + (1 - words[3][2],) + words[3][3:]
+        words[20] = (1 - words[20][0], 1 - words[20][1]) + words[20][2:]
+        bits = "".join(str(bit) for word in words for bit in word) + "1" * 9
+        src = int(bits, 2).to_bytes(len(bits) // 8, "big")
+
+        dst = array("B", bytes(22))
+        status = array("b", bytes(22))
+        counts = self.instance.decode_into(src, dst, status)
+        self.assertEqual(
+            counts,
+            {HCResult.VALID: 19, HCResult.CORRECTED: 1, HCResult.UNCORRECTABLE: 1},
+        )
+        for i, word in enumerate(words):
+            data, result = self.instance.decode(word)
+            self.assertEqual(RESULTS_BY_CODE[status[i]], result)
+            self.assertEqual(
+                dst[i], 0 if data is None else int("".join(map(str, data)), 2)
+            )
+        self.assertEqual(dst[21], 0)
+
+        with self.assertRaises(ValueError):
+            self.instance.decode_into(src, bytearray(20))
+        with self.assertRaises(ValueError):
+            self.instance.decode_into(src, bytearray(21), array("b"))
+
+    def test_screening(self):
+        """Test methods is_valid(), count_invalid() and iter_invalid_indices()"""
+        direct = HammingCode(lookup_tables=False)
+        for code in product((0, 1), repeat=11):
+            expected = self.instance.decode(code)[1] is HCResult.VALID
+            self.assertEqual(self.instance.is_valid(code), expected)
+            self.assertEqual(direct.is_valid(code), expected)
+            self.assertEqual(
+                self.instance.is_valid(int("".join(map(str, code)), 2)), expected
+            )
+
+        rng = random.Random(8)
+        for code in (self.instance, HammingCode(7, 4), HammingCode(31, 26)):
+            data = bytes(rng.randrange(256) for _ in range(5000))
+            encoded = bytearray(b"".join(code.encode_stream(data)))
+            self.assertEqual(code.count_invalid(encoded), 0)
+            for _ in range(300):
+                bit = rng.randrange(len(encoded) * 8)
+                encoded[bit // 8] ^= 0x80 >> (bit % 8)
+
+            words = len(encoded) * 8 // (code.total_bits + 1)
+            status = array("b", bytes(words))
+            code.decode_into(encoded, array("L", [0]) * words, status)
+            expected = [i for i, result_code in enumerate(status) if result_code]
+            self.assertEqual(list(code.iter_invalid_indices(encoded)), expected)
+            self.assertEqual(code.count_invalid(encoded), len(expected))
+
+    def test_decode_file(self):
+        """Test method decode_file()"""
+        data = bytes(range(256)) * 4 + b"end"
+        encoded = bytearray(b"".join(self.instance.encode_stream(data)))
+        # Correctable error in the first, uncorrectable errors in the second codeword
+        encoded[0] ^= 0x80
+        encoded[1] ^= 0x0C
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "capture.bin")
+            with open(path, "wb") as file:
+                file.write(encoded)
+
+            out, status = self.instance.decode_file(path)
+            self.assertEqual(len(out), self.instance.decoded_size(encoded))
+            self.assertEqual(len(out), len(data))
+            self.assertEqual(out[2:], data[2:])
+            self.assertEqual(len(status), len(encoded) * 8 // 11)
+            self.assertEqual(status[:3].tolist(), [1, 2, 0])
+            self.assertEqual(set(status[3:]), {0})
+
+            # Decode into a memory-mapped output file
+            out_path = os.path.join(directory, "decoded.bin")
+            with open(out_path, "w+b") as file:
+                file.truncate(len(data))
+                with mmap.mmap(file.fileno(), 0) as out:
+                    status = bytearray(len(encoded))
+                    self.instance.decode_file(path, out, status)
+                    self.assertEqual(out[2:], data[2:])
+                    self.assertEqual(status[:3], b"\x01\x02\x00")
+
+            with self.assertRaises(ValueError):
+                self.instance.decode_file(path, bytearray(10))
+
+            # A damaged last block raises the documented error
+            damaged = bytearray(b"".join(self.instance.encode_stream(b"hello")))
+            damaged[8] ^= 0x30
+            with open(path, "wb") as file:
+                file.write(damaged)
+            with self.assertRaisesRegex(ValueError, "End of stream marker"):
+                self.instance.decode_file(path)
+
+            # Empty files decode to nothing
+            empty_path = os.path.join(directory, "empty.bin")
+            open(empty_path, "wb").close()
+            self.assertEqual(
+                self.instance.decode_file(empty_path), (bytearray(), array("b"))
+            )
+
+    def test_parallel_decode(self):
+        """Test function parallel_decode()"""
+        data = bytes(range(256)) * 40 + b"tail"
+        encoded = bytearray(b"".join(self.instance.encode_stream(data)))
+        encoded[0] ^= 0x80
+        encoded[1] ^= 0x0C
+
+        decoded, status = parallel_decode(encoded, workers=2)
+        self.assertEqual(decoded[2:], data[2:])
+        self.assertEqual(status[:3].tolist(), [1, 2, 0])
+        self.assertEqual(len(status), len(encoded) * 8 // 11)
+        self.assertEqual(set(status[3:]), {0})
+
+        self.assertEqual(parallel_decode(b"", workers=2), (b"", array("b")))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+import asyncio
+import random
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from hamming_code import HammingCode
+from hamming_code_async import decode_reader, encode_writer
+
+
+def make_reader(data: bytes) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+async def collect(chunks) -> bytes:
+    return b"".join([chunk async for chunk in chunks])
+
+
+class TestHammingCodeAsync(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.code = HammingCode()
+
+    async def test_decode_reader(self):
+        """Test that decode_reader() matches decode_stream()"""
+        rng = random.Random(6)
+        for length in (0, 5, 6, 1000):
+            data = bytes(rng.randrange(256) for _ in range(length))
+            for depth in (1, 16):
+                encoded = b"".join(
+                    self.code.encode_stream(data, interleave_depth=depth)
+                )
+                decoded = await collect(
+                    decode_reader(
+                        self.code,
+                        make_reader(encoded),
+                        chunk_size=30,
+                        interleave_depth=depth,
+                    )
+                )
+                self.assertEqual(decoded, data)
+
+        # Uncorrectable codewords are reported with their index
+        damaged = bytearray(b"".join(self.code.encode_stream(bytes(100))))
+        damaged[44] ^= 0x30
+        with self.assertRaisesRegex(ValueError, "index 32"):
+            await collect(decode_reader(self.code, make_reader(damaged), 22))
+        decoded = await collect(
+            decode_reader(self.code, make_reader(damaged), 22, strict=False)
+        )
+        self.assertEqual(len(decoded), 100)
+
+    async def test_code_settings(self):
+        """Test that the settings and statistics of the code are used"""
+        data = bytes(random.Random(8).randrange(256) for _ in range(600))
+        encoded = bytearray(b"".join(self.code.encode_stream(data)))
+        encoded[3] ^= 0x10
+        expected = HammingCode(stats=True)
+        self.assertEqual(b"".join(expected.decode_stream([bytes(encoded)])), data)
+
+        code = HammingCode(stats=True)
+        decoded = await collect(decode_reader(code, make_reader(encoded), 30))
+        self.assertEqual(decoded, data)
+        snapshot, reference = code.stats.snapshot(), expected.stats.snapshot()
+        for name in ("results", "corrected_positions", "parity_corrections"):
+            self.assertEqual(snapshot[name], reference[name])
+        self.assertEqual(snapshot["results"]["CORRECTED"], 1)
+
+        # Worker processes create the code with the same options
+        code = HammingCode(lookup_tables=False, specialized=True)
+        self.assertEqual(
+            code.options,
+            {
+                "lookup_tables": False,
+                "stats": False,
+                "specialized": True,
+                "cache_dir": None,
+            },
+        )
+        with ProcessPoolExecutor(1) as executor:
+            decoded = await collect(
+                decode_reader(code, make_reader(encoded), 30, executor=executor)
+            )
+        self.assertEqual(decoded, data)
+
+    async def test_encode_writer(self):
+        """Test a round trip over a TCP connection"""
+        data = bytes(random.Random(7).randrange(256) for _ in range(5000))
+        received = []
+
+        async def handle(reader, writer):
+            received.append(
+                await collect(decode_reader(self.code, reader, interleave_depth=8))
+            )
+            writer.close()
+
+        async def source():
+            for start in range(0, len(data), 333):
+                yield data[start : start + 333]
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        async with server:
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            with ThreadPoolExecutor(2) as executor:
+                written = await encode_writer(
+                    self.code,
+                    source(),
+                    writer,
+                    chunk_size=1000,
+                    interleave_depth=8,
+                    executor=executor,
+                )
+            writer.write_eof()
+            await reader.read()
+            writer.close()
+            await writer.wait_closed()
+
+        self.assertEqual(received, [data])
+        self.assertEqual(
+            written, len(b"".join(self.code.encode_stream(data, interleave_depth=8)))
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
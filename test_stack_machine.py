@@ -2,10 +2,17 @@
 
 import unittest
 import io
+import pickle
 import unittest.mock
 from math import factorial
 
-from stack_machine import StackMachine, Instruction, SMState
+from stack_machine import (
+    CompiledProgram,
+    OperandStack,
+    StackMachine,
+    Instruction,
+    SMState,
+)
 
 
 class TestStackMachine(unittest.TestCase):
@@ -81,6 +88,105 @@ class TestStackMachine(unittest.TestCase):
             ],
         )
 
+    def test_operand_stack(self):
+        stack = OperandStack(
+            ["A", (0, 0, 0, 0, 0, 1, 0, 1), 300, (1, 0, 0, 0, 0, 0, 0, 0, 0)]
+        )
+        stack.push_byte(7)
+        # Bytes and characters are stored as raw bytes, everything else on the side
+        self.assertEqual(bytes(stack._values), b"A\x05\x00\x00\x07")
+        self.assertEqual(stack._others, {2: 300, 3: (1, 0, 0, 0, 0, 0, 0, 0, 0)})
+        self.assertEqual(len(stack), 5)
+        self.assertEqual(stack[-1], self._intToByteTuple(7))
+        self.assertEqual(stack[1:3], [(0, 0, 0, 0, 0, 1, 0, 1), 300])
+        self.assertEqual(
+            stack,
+            [
+                "A",
+                self._intToByteTuple(5),
+                300,
+                (1, 0, 0, 0, 0, 0, 0, 0, 0),
+                self._intToByteTuple(7),
+            ],
+        )
+        self.assertNotEqual(stack, ["A"])
+
+        # Operands are ints, except for characters and other items
+        self.assertEqual(stack.pop_operand(), 7)
+        self.assertEqual(stack.pop_operand(), 256)
+        self.assertEqual(stack.pop(), 300)
+        self.assertEqual(stack.pop_operand(), 5)
+        self.assertEqual(stack.pop_operand(), "A")
+        self.assertEqual(stack, [])
+        with self.assertRaises(IndexError):
+            stack.pop_operand()
+        with self.assertRaises(IndexError):
+            stack[0]
+
+        # The list methods work on the compact storage
+        a, b = self._intToByteTuple(1), self._intToByteTuple(2)
+        items = [a, "C", 300, b, a]
+        stack = OperandStack(items)
+        stack[1] = 400
+        stack[2] = "D"
+        items[1], items[2] = 400, "D"
+        self.assertEqual(stack, items)
+        self.assertEqual(stack._others, {1: 400})
+        stack.insert(0, (1, 2))
+        stack.insert(-1, "E")
+        stack.insert(99, 500)
+        items.insert(0, (1, 2))
+        items.insert(-1, "E")
+        items.insert(99, 500)
+        self.assertEqual(stack, items)
+        del stack[1]
+        del items[1]
+        self.assertEqual(stack, items)
+        self.assertEqual(stack._others, {0: (1, 2), 1: 400, 6: 500})
+        self.assertEqual(stack.pop(1), items.pop(1))
+        self.assertEqual(stack.index("D"), items.index("D"))
+        self.assertEqual(stack.count(a), items.count(a))
+        stack.remove(b)
+        items.remove(b)
+        stack.reverse()
+        items.reverse()
+        self.assertEqual(stack, items)
+        stack[1:3] = ["F"]
+        items[1:3] = ["F"]
+        del stack[::2]
+        del items[::2]
+        self.assertEqual(stack, items)
+        self.assertEqual(stack + [a], items + [a])
+        self.assertEqual([a] + stack, [a] + items)
+        self.assertIsInstance(stack + stack, list)
+        copy = stack.copy()
+        copy.append("G")
+        self.assertEqual(stack, items)
+        self.assertEqual(copy, items + ["G"])
+        stack += ["H"]
+        self.assertEqual(stack, items + ["H"])
+        self.assertIn("H", stack)
+        with self.assertRaises(IndexError):
+            stack[10] = a
+        with self.assertRaises(IndexError):
+            del stack[-10]
+
+        # Assigning a list replaces the contents
+        sm = StackMachine()
+        stack = sm.stack
+        sm.stack = ["B", (1, 1, 1, 1, 1, 1, 1, 1)]
+        self.assertIs(sm.stack, stack)
+        self.assertEqual(sm._pop_operands_from_stack(2), (255, "B"))
+
+        # In-place operators and assigning the stack to itself keep the contents
+        sm.stack = ["B"]
+        sm.stack += ["C"]
+        self.assertEqual(sm.stack, ["B", "C"])
+        sm.stack = sm.stack
+        self.assertEqual(sm.stack, ["B", "C"])
+        sm.stack = iter(sm.stack[::-1])
+        self.assertEqual(sm.stack, ["C", "B"])
+
     def _inputValueToTuple(self, value: int) -> tuple:
         return tuple(int(bit) for bit in bin(value)[2:].zfill(6))
 
@@ -180,6 +286,25 @@ class TestStackMachine(unittest.TestCase):
                 chr(ord("A") + i),
             )
 
+    def test_parse_byte_table(self):
+        # Tuples, ints and longer tuples parse alike
+        for i in range(64):
+            parsed = self.sm._parse_byte(self._inputValueToTuple(i))
+            self.assertEqual(self.sm._parse_byte(i), parsed)
+            self.assertEqual(
+                self.sm._parse_byte(list(self._inputValueToTuple(i))), parsed
+            )
+            self.assertEqual(
+                self.sm._parse_byte((0, 0) + self._inputValueToTuple(i)), parsed
+            )
+        for i in (64, 255, 256, 1000):
+            self.assertEqual(self.sm._parse_byte(i), Instruction.NOP)
+
+        # The results are shared by all machines
+        self.assertIs(
+            self.sm._parse_byte(40), StackMachine()._parse_byte((1, 0, 1, 0, 0, 0))
+        )
+
     def test_pop_operands_from_stack(self):
         init_stack = [
             self._intToByteTuple(1),
@@ -251,6 +376,119 @@ class TestStackMachine(unittest.TestCase):
         self.assertEqual(mock_stdout.getvalue()[:-1], "RES 64")
         self.assertEqual(self.sm.stack, [])
 
+    def test_dispatch(self):
+        # Every instruction has exactly one handler
+        self.assertEqual(
+            set(StackMachine._DISPATCH), {instr.value for instr in Instruction}
+        )
+        for instr in Instruction:
+            handler, _ = StackMachine._DISPATCH[instr.value]
+            self.assertEqual(handler.__name__, f"_instr_{instr.name.lower()}")
+
+        # A failing instruction changes the overflow flag exactly like before the dispatch
+        # table: ADD, SUB, MUL and EXP keep it, DIV clears it after popping, the others
+        # clear it before popping
+        cases = [
+            (Instruction.ADD, [], True),
+            (Instruction.ADD, [self._intToByteTuple(1), "A"], True),
+            (Instruction.SUB, [self._intToByteTuple(1)], True),
+            (Instruction.MUL, ["A", "B"], True),
+            (Instruction.EXP, [], True),
+            (Instruction.DIV, [self._intToByteTuple(1)], True),
+            (
+                Instruction.DIV,
+                [self._intToByteTuple(1), self._intToByteTuple(0)],
+                False,
+            ),
+            (Instruction.MOD, [], False),
+            (Instruction.SHL, [], False),
+            (Instruction.FAC, ["A"], False),
+        ]
+        for instr, stack, overflow in cases:
+            self.sm.stack = stack
+            self.sm.overflow = True
+            self.assertEqual(
+                self.sm.do(self._inputValueToTuple(instr.value)), SMState.ERROR
+            )
+            self.assertEqual(self.sm.overflow, overflow, instr)
+
+        # Successful instructions set the flag according to the wrap
+        self.sm.stack = [self._intToByteTuple(200), self._intToByteTuple(100)]
+        self.sm.do(self._inputValueToTuple(Instruction.ADD.value))
+        self.assertEqual(self.sm.stack, [self._intToByteTuple(44)])
+        self.assertEqual(self.sm.overflow, True)
+        self.sm.stack = [self._intToByteTuple(9), self._intToByteTuple(3)]
+        self.sm.do(self._inputValueToTuple(Instruction.DIV.value))
+        self.assertEqual(self.sm.stack, [self._intToByteTuple(3)])
+        self.assertEqual(self.sm.overflow, False)
+
+    @unittest.mock.patch("sys.stdout", new_callable=io.StringIO)
+    def test_run(self, mock_stdout):
+        # Same program as in test_do, as ints
+        program = bytes(
+            [10, 17, 17, 22, 31, 4, 27, 4, 25, 6, 24, 34, 54, 40, 53, 5, 33, 16, 1]
+        )
+        self.assertEqual(self.sm.run(program), (SMState.STOPPED, 18, 17))
+        self.assertEqual(mock_stdout.getvalue()[:-1], "RES 64")
+        self.assertEqual(self.sm.stack, [])
+
+        # Tuples, end of input and continuing on an existing stack
+        self.sm.stack = []
+        words = [self._inputValueToTuple(value) for value in (2, 3, 1)]
+        self.assertEqual(self.sm.run(iter(words)), (SMState.RUNNING, 3, 3))
+        self.assertEqual(self.sm.run([20, 20]), (SMState.RUNNING, 2, 2))
+        self.assertEqual(self.sm.stack, [self._intToByteTuple(6)])
+        self.assertEqual(self.sm.run([]), (SMState.RUNNING, 0, 0))
+
+        # Step limit
+        self.assertEqual(
+            self.sm.run([1, 2, 3, 16], max_steps=2), (SMState.RUNNING, 2, 2)
+        )
+        self.assertEqual(self.sm.stack, [self._intToByteTuple(i) for i in (6, 1, 2)])
+
+        # Errors stop at the failing code word
+        self.sm.stack = []
+        self.assertEqual(self.sm.run([5, 0, 23, 1, 16]), (SMState.ERROR, 3, 2))
+        self.assertEqual(self.sm.run([20]), (SMState.ERROR, 1, 0))
+
+    @unittest.mock.patch("sys.stdout", new_callable=io.StringIO)
+    def test_compile(self, mock_stdout):
+        program = bytes(
+            [10, 17, 17, 22, 31, 4, 27, 4, 25, 6, 24, 34, 54, 40, 53, 5, 33, 16, 1]
+        )
+        compiled = StackMachine.compile(
+            [self._inputValueToTuple(value) for value in program]
+        )
+        self.assertIsInstance(compiled, CompiledProgram)
+        self.assertEqual(compiled, StackMachine.compile(program))
+        self.assertEqual(len(compiled), len(program))
+
+        # Repeated runs on fresh machines, also after pickling
+        for runs in (compiled, pickle.loads(pickle.dumps(compiled))):
+            for _ in range(2):
+                sm = StackMachine()
+                self.assertEqual(sm.run(runs), (SMState.STOPPED, 18, 17))
+                self.assertEqual(sm.stack, [])
+        self.assertEqual(mock_stdout.getvalue(), "RES 64\n" * 4)
+
+        # Same results as the code words on an existing machine
+        for program in ([2, 3, 1, 20, 20, 30, 50], [5, 0, 23, 1, 16], [20], [48, 62]):
+            for max_steps in (None, 2):
+                expected = StackMachine()
+                expected.stack = [self._intToByteTuple(7)]
+                sm = StackMachine()
+                sm.stack = [self._intToByteTuple(7)]
+                self.assertEqual(
+                    sm.run(StackMachine.compile(program), max_steps),
+                    expected.run(program, max_steps),
+                )
+                self.assertEqual(sm.stack, expected.stack)
+                self.assertEqual(sm.overflow, expected.overflow)
+
+        for invalid in ([64], [-1], [(1, 0, 1)], [(0, 1, 0, 1, 0, 2)], [None]):
+            with self.assertRaises(ValueError):
+                StackMachine.compile(invalid)
+
     # Test individual instructions
     def test_instruction_stp(self):
         instr = self._inputValueToTuple(Instruction.STP.value)